@@ -0,0 +1,93 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from api.controllers.cache_utilities import get_or_build
+from api.controllers.pagination import paginate
+from api.controllers.privileges import ADMIN, club_privileges
+from api.controllers.serializers import Serializer
+from api.models import Club, ClubMemberRelationship, Project
+
+# Payload of a club in the admin panel, see PROJECT_FIELDS for the format.
+# Heads are shown by email.
+ADMIN_CLUB_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'abstract': 'abstract',
+    'link': 'link',
+    'image': 'image',
+    'head': 'head__email',
+    'project_count': 'project_count',
+    'admin_count': 'admin_count',
+}
+
+ADMIN_PROJECT_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'abstract': 'abstract',
+    'link': 'link',
+    'image': 'image',
+    'head': 'head__email',
+}
+
+admin_club_serializer = Serializer(ADMIN_CLUB_FIELDS)
+admin_project_serializer = Serializer(ADMIN_PROJECT_FIELDS)
+
+
+def club_count(queryset):
+    '''
+    Number of rows of queryset belonging to the outer club. Counted in a
+    correlated subquery rather than a join, so that several counts do not
+    multiply each other's rows.
+    '''
+    counts = queryset.filter(club=OuterRef('pk')).order_by().values('club').annotate(count=Count('id')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def admin_clubs():
+    '''
+    Clubs annotated with their number of projects and of admins
+    '''
+    return Club.objects.annotate(
+        project_count=club_count(Project.objects.all()),
+        admin_count=club_count(ClubMemberRelationship.objects.filter(privilege_id=club_privileges.id(ADMIN))),
+    )
+
+
+def admin_club_detail(name, params, fields=None):
+    '''
+    Details of the club with the given name for the admin panel, or None if
+    there is none: the club with its counts, its admins and one page of its
+    projects, in three queries. Raises ValueError on an invalid cursor or
+    page size.
+    '''
+    clubs, serialize_club = admin_club_serializer.rows(admin_clubs().filter(name=name), fields)
+    club = clubs.first()
+    if club is None:
+        return None
+
+    admins = ClubMemberRelationship.objects.filter(
+        club=club.id, privilege_id=club_privileges.id(ADMIN)
+    ).order_by("id").values("user__id", "user__email", "user__name")
+
+    projects, serialize_project = admin_project_serializer.rows(Project.objects.filter(club=club.id))
+    projects, next_cursor = paginate(projects, params)
+
+    data = serialize_club(club)
+    data["admin_users"] = [
+        {"id": admin["user__id"], "email": admin["user__email"], "name": admin["user__name"]}
+        for admin in admins
+    ]
+    data["projects"] = [serialize_project(project) for project in projects]
+    data["next"] = next_cursor
+    return data
+
+
+def cached_admin_club_detail(name, params, fields=None):
+    '''
+    admin_club_detail(), cached until the club, its admins or its projects
+    change (see api/signals.py)
+    '''
+    return get_or_build(
+        'admin_club_detail', ['admin_club:' + name], (name, sorted(params.lists()), fields),
+        lambda: admin_club_detail(name, params, fields)
+    )
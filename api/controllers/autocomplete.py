@@ -0,0 +1,141 @@
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import connections
+
+from api.controllers.search_index import WorkerIndex, fold
+from api.models import Club, Project
+
+# Kinds of names suggested, in the order they are listed on a tie
+KINDS = ('club', 'project')
+
+MODELS = {'club': Club, 'project': Project}
+
+MAX_LIMIT = 50
+
+
+def name_keys(name):
+    '''
+    Keys a name is found under: the whole folded name and every suffix of it
+    starting at a word, so that "Robotics Club" is found by "rob" and "club"
+    '''
+    folded = ' '.join(fold(name).split())
+    keys = [folded]
+    for i, char in enumerate(folded):
+        if char == ' ':
+            keys.append(folded[i + 1:])
+    return keys
+
+
+class Names:
+    '''
+    Club and project names, as a sorted array of (key, kind, id) entries.
+    A prefix lookup is a bisect followed by a scan of at most a few entries
+    past the first match.
+    '''
+
+    def __init__(self, entries=None, names=None):
+        self.entries = entries if entries is not None else []
+        self.names = names if names is not None else {}
+
+    def copy(self):
+        return Names(list(self.entries), dict(self.names))
+
+    def add(self, kind, doc_id, name):
+        self.remove(kind, doc_id)
+        self.names[(kind, doc_id)] = name
+        for key in name_keys(name):
+            insort(self.entries, (key, KINDS.index(kind), doc_id))
+
+    def remove(self, kind, doc_id):
+        name = self.names.pop((kind, doc_id), None)
+        if name is None:
+            return
+        for key in name_keys(name):
+            entry = (key, KINDS.index(kind), doc_id)
+            del self.entries[bisect_left(self.entries, entry)]
+
+    def complete(self, prefix, limit, kinds=KINDS):
+        '''
+        Up to limit distinct names starting with prefix, or with a word
+        starting with it, in alphabetical order of the matched key
+        '''
+        prefix = ' '.join(fold(prefix).split())
+        if not prefix:
+            return []
+
+        entries = self.entries
+        kind_codes = {KINDS.index(kind) for kind in kinds}
+        found, seen = [], set()
+        for i in range(bisect_left(entries, (prefix,)), len(entries)):
+            key, kind, doc_id = entries[i]
+            if not key.startswith(prefix):
+                break
+            if kind not in kind_codes or (kind, doc_id) in seen:
+                continue
+            seen.add((kind, doc_id))
+            found.append({'type': KINDS[kind], 'name': self.names[(KINDS[kind], doc_id)]})
+            if len(found) == limit:
+                break
+        return found
+
+
+class NameIndex(WorkerIndex):
+    '''
+    Club and project names of this worker. Writes re-index the changed
+    names in a copy, which then replaces the names being searched.
+    '''
+    version_name = 'autocomplete'
+
+    def build(self):
+        entries, names = [], {}
+        for kind, model in MODELS.items():
+            for doc_id, name in model.objects.values_list('id', 'name').iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE):
+                names[(kind, doc_id)] = name
+                entries.extend((key, KINDS.index(kind), doc_id) for key in name_keys(name))
+        entries.sort()
+        return Names(entries, names)
+
+    def apply(self, data, project_ids=(), club_ids=()):
+        data = data.copy()
+        for kind, ids in (('project', project_ids), ('club', club_ids)):
+            for doc_id in ids:
+                data.remove(kind, doc_id)
+            for doc_id, name in MODELS[kind].objects.filter(id__in=ids).values_list('id', 'name'):
+                data.add(kind, doc_id, name)
+        return data
+
+    def complete(self, prefix, limit, kinds=KINDS):
+        return self.current().complete(prefix, limit, kinds)
+
+
+name_index = NameIndex()
+
+
+def parse_limit(params):
+    '''
+    Reads the number of suggestions from the query params, clamped to the
+    allowed range. Raises ValueError if it is not an integer.
+    '''
+    limit = params.get('limit')
+    if limit is None:
+        return settings.AUTOCOMPLETE_LIMIT
+    return max(1, min(int(limit), MAX_LIMIT))
+
+
+def parse_kinds(params):
+    '''
+    Reads ?type=club or ?type=project, both by default. Raises ValueError
+    on any other type.
+    '''
+    kind = params.get('type')
+    if kind is None:
+        return KINDS
+    if kind not in KINDS:
+        raise ValueError("Invalid type")
+    return (kind,)
+
+
+def warm_up():
+    name_index.current()
+    connections.close_all()
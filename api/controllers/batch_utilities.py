@@ -0,0 +1,40 @@
+from django.conf import settings
+
+
+def parse_batch(params):
+    '''
+    Reads the entries of a batch request, given either by name
+    (?name=a&name=b) or by id (?id=1&id=2). Returns the field they are
+    looked up by and the distinct values, in request order. Raises
+    ValueError with the message to return on an invalid batch.
+    '''
+    names, ids = params.getlist('name'), params.getlist('id')
+    if bool(names) == bool(ids):
+        raise ValueError("Either names or ids are required")
+
+    if names:
+        lookup, values = 'name', names
+    else:
+        try:
+            lookup, values = 'id', [int(value) for value in ids]
+        except ValueError:
+            raise ValueError("Invalid id")
+
+    values = list(dict.fromkeys(values))
+    if len(values) > settings.API_MAX_PAGE_SIZE:
+        raise ValueError("At most {} entries can be requested at once".format(settings.API_MAX_PAGE_SIZE))
+    return lookup, values
+
+
+def batch_results(lookup, values, details, missing):
+    '''
+    One result per requested value, in request order: the details if
+    found, otherwise the given error message
+    '''
+    results = []
+    for value in values:
+        if value in details:
+            results.append({lookup: value, 'data': details[value]})
+        else:
+            results.append({lookup: value, 'error': missing})
+    return results
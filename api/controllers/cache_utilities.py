@@ -0,0 +1,106 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+
+# Cached entries are keyed on the current version of every entity they were
+# built from. Writes bump those versions (see api/signals.py), which orphans
+# the stale entries instead of deleting them; they then expire on their own.
+#
+# Entity names used across the app:
+#   projects           - project listings and search
+#   clubs              - club listings and search
+#   project:<name>     - a single project
+#   club:<name>        - a single club
+#   dashboard:<user id> - the club head dashboard of a user
+#   admin_club:<name>  - a club in the admin panel
+
+
+def hashed(value):
+    return hashlib.md5(str(value).encode()).hexdigest()
+
+
+def version_key(name):
+    return 'version:' + hashed(name)
+
+
+def new_version():
+    # Unique across restarts and evictions, unlike a counter starting at 1,
+    # so a lost version can never make stale entries reachable again.
+    return time.time_ns()
+
+
+def get_versions(names):
+    '''
+    Returns the current versions of the given entities
+    '''
+    keys = [version_key(name) for name in names]
+    found = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump_versions(*names):
+    '''
+    Invalidates every cached entry built from the given entities. Returns
+    their new version.
+    '''
+    version = new_version()
+    cache.set_many({version_key(name): version for name in names}, timeout=None)
+    return version
+
+
+def versioned_key(prefix, names, *parts):
+    return '{}:{}'.format(prefix, hashed((parts, get_versions(names))))
+
+
+def get_or_build(prefix, names, parts, build):
+    '''
+    Returns the value cached under prefix and parts until one of the given
+    entities changes, calling build() to compute it on a miss. None values
+    are not cached.
+    '''
+    key = versioned_key(prefix, names, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        if value is not None:
+            cache.set(key, value)
+    return value
+
+
+def entity_names(names, kwargs):
+    '''
+    Fills the view kwargs into entity name templates like 'project:{project_name}'
+    '''
+    return [name.format(**kwargs) for name in names]
+
+
+def response_cache_key(*names):
+    '''
+    Returns a key function for CachedJsonResponseDec, keying the response
+    on the full request path and the versions of the given entities.
+    '''
+    def key_func(request, *args, **kwargs):
+        return versioned_key('encoded_response', entity_names(names, kwargs), request.get_full_path())
+    return key_func
+
+
+def versioned_cache(*names):
+    '''
+    Caches the result of func(request, *args, **kwargs) until one of the
+    given entities changes. None results are not cached.
+    '''
+    def decorator(func):
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            return get_or_build(
+                func.__name__, entity_names(names, kwargs), (request.get_full_path(),),
+                lambda: func(request, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -1,4 +1,5 @@
-from api.models import Club, ClubMemberPrivilege, ClubMemberRelationship
+from api.controllers.privileges import ADMIN, club_privileges
+from api.models import Club, ClubMemberRelationship
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,14 +9,49 @@ def create_club(name, abstract, link, head, uploaded_file_url):
         Helper to create club and assign club user relationship
     """
     try:
-        club_member_privilege = ClubMemberPrivilege.objects.filter(name = "Admin")
-        if club_member_privilege.exists():
+        club_member_privilege = club_privileges.get(ADMIN)
+        if club_member_privilege is not None:
             club = Club.objects.create(name = name, abstract = abstract, link=link, head = head, image = uploaded_file_url)
-            ClubMemberRelationship.objects.create(club = club, user = head, privilege = club_member_privilege[0])
+            ClubMemberRelationship.objects.create(club = club, user = head, privilege = club_member_privilege)
             return True
         else:
             logger.error("Admin access not found")
             return False
     except Exception as e:
         logger.error(e)
-        return False
\ No newline at end of file
+        return False
+
+
+def club_detail_dict(club):
+    """
+    Detail payload of a club. Expects head to be select_related.
+    """
+    return {
+        "id": club.id,
+        "name": club.name,
+        "email": club.head.email,
+        "abstract": club.abstract,
+        "link": club.link,
+        "image": club.image.url if club.image else None
+    }
+
+
+def club_detail(name):
+    """
+    Details of the club with the given name, or None if there is none.
+    Runs a single query, joining the head, through the name index.
+    """
+    try:
+        club = Club.objects.select_related("head").get(name=name)
+    except Club.DoesNotExist:
+        return None
+    return club_detail_dict(club)
+
+
+def club_details(lookup, values):
+    """
+    Details of the clubs whose `lookup` field ("name" or "id") is one of
+    values, keyed by that field. Runs a single query.
+    """
+    clubs = Club.objects.select_related("head").filter(**{lookup + "__in": values})
+    return {getattr(club, lookup): club_detail_dict(club) for club in clubs}
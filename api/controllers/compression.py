@@ -0,0 +1,84 @@
+import re
+
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as is, compressing them does not pay off
+MIN_COMPRESS_LENGTH = 200
+
+# Encodings we can produce, in order of preference
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+ACCEPT_ENCODING_RE = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$')
+
+
+def accepted_encodings(accept_encoding):
+    '''
+    Parses an Accept-Encoding header into the set of encodings the client
+    accepts, leaving out those with q=0
+    '''
+    accepted = set()
+    for part in accept_encoding.split(','):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        encoding, quality = match.groups()
+        try:
+            if quality is not None and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(encoding.lower())
+    return accepted
+
+
+def negotiate(request):
+    '''
+    Returns the preferred encoding the client accepts, None for identity
+    '''
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding in ENCODINGS:
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, mode=brotli.MODE_TEXT)
+    return compress_string(content)
+
+
+def compress_stream(chunks, encoding):
+    if encoding == 'gzip':
+        return compress_sequence(chunks)
+    return brotli_sequence(chunks)
+
+
+def brotli_sequence(chunks):
+    '''
+    Brotli counterpart of django.utils.text.compress_sequence. Every chunk
+    is flushed so that the client can start parsing right away.
+    '''
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+    for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def precompress(content):
+    '''
+    Compresses content with every supported encoding, for bodies that are
+    stored once and served many times
+    '''
+    variants = {None: content}
+    if len(content) >= MIN_COMPRESS_LENGTH:
+        for encoding in ENCODINGS:
+            variants[encoding] = compress(content, encoding)
+    return variants
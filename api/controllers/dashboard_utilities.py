@@ -0,0 +1,74 @@
+from django.db.models import Prefetch
+
+from api.controllers.cache_utilities import get_or_build
+from api.controllers.privileges import ADMIN, club_privileges
+from api.models import Club, ClubMemberRelationship, Project
+
+
+def dashboard_project(project):
+    return {
+        "id": project.id,
+        "name": project.name,
+        "abstract": project.abstract,
+        "link": project.link,
+        "image": project.image.url if project.image else None,
+        "head": project.head.email if project.head else None
+    }
+
+
+def dashboard_club(club):
+    return {
+        "club": {
+            "id": club.id,
+            "name": club.name,
+            "abstract": club.abstract,
+            "link": club.link,
+            "image": club.image.url if club.image else None,
+            "head": club.head.email if club.head else None
+        },
+        "club_heads": [
+            {
+                "id": relationship.user.id,
+                "email": relationship.user.email,
+                "name": relationship.user.name
+            }
+            for relationship in club.admin_relationships
+        ],
+        "projects": [dashboard_project(project) for project in club.dashboard_projects]
+    }
+
+
+def club_head_dashboard(user):
+    """
+    Clubs the user is a head (Admin) of, each with its heads and projects.
+    Runs three queries however many clubs, heads and projects there are:
+    the clubs with their head, then the heads of all of them, then all
+    their projects with the project heads.
+    """
+    admin_relationships = ClubMemberRelationship.objects.filter(privilege_id=club_privileges.id(ADMIN))
+    clubs = Club.objects.filter(
+        id__in=admin_relationships.filter(user=user).values("club")
+    ).select_related("head").prefetch_related(
+        Prefetch(
+            "clubmemberrelationship_set",
+            queryset=admin_relationships.select_related("user").order_by("id"),
+            to_attr="admin_relationships"
+        ),
+        Prefetch(
+            "project_set",
+            queryset=Project.objects.select_related("head"),
+            to_attr="dashboard_projects"
+        )
+    )
+    return [dashboard_club(club) for club in clubs]
+
+
+def cached_club_head_dashboard(user):
+    """
+    club_head_dashboard(user), cached until one of the user's clubs, their
+    admins or their projects change (see api/signals.py)
+    """
+    return get_or_build(
+        "club_head_dashboard", ["dashboard:{}".format(user.id)], (user.id,),
+        lambda: club_head_dashboard(user)
+    )
@@ -0,0 +1,86 @@
+import hashlib
+
+from django.db.models import Count, Max
+
+from api.controllers.cache_utilities import versioned_cache
+from api.controllers.request_utilities import memoize_on_request
+from api.models import Club, Project
+
+
+def make_etag(*parts):
+    '''
+    Hashes the given parts into a strong entity tag
+    '''
+    return hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def table_state(model):
+    '''
+    Latest update time and row count of a table. A row being created or
+    edited moves the former, a row being deleted changes the latter.
+    '''
+    state = model.objects.aggregate(last_updated=Max('updated_at'), count=Count('id'))
+    return state['last_updated'], state['count']
+
+
+# Listings only get an ETag. Deleting a row does not move max(updated_at),
+# so a Last-Modified date could not invalidate them, while the row count in
+# the ETag does.
+
+@versioned_cache('projects')
+def projects_etag(request, *args, **kwargs):
+    '''
+    Project listings embed the club name, so club changes count as well
+    '''
+    return make_etag(request.get_full_path(), *table_state(Project), *table_state(Club))
+
+
+@versioned_cache('clubs')
+def clubs_etag(request, *args, **kwargs):
+    return make_etag(request.get_full_path(), *table_state(Club))
+
+
+@memoize_on_request
+@versioned_cache('project:{project_name}')
+def project_detail_state(request, project_name):
+    return Project.objects.filter(name=project_name).values(
+        'id', 'updated_at', 'head__updated_at'
+    ).annotate(
+        member_count=Count('members'), last_member=Max('members__id')
+    ).first()
+
+
+def project_detail_etag(request, project_name):
+    state = project_detail_state(request, project_name=project_name)
+    if state is None:
+        return None
+    return make_etag(request.get_full_path(), *state.values())
+
+
+def project_detail_last_modified(request, project_name):
+    state = project_detail_state(request, project_name=project_name)
+    if state is None:
+        return None
+    return max(state['updated_at'], state['head__updated_at'])
+
+
+@memoize_on_request
+@versioned_cache('club:{club_name}')
+def club_detail_state(request, club_name):
+    return Club.objects.filter(name=club_name).values(
+        'id', 'updated_at', 'head__updated_at'
+    ).first()
+
+
+def club_detail_etag(request, club_name):
+    state = club_detail_state(request, club_name=club_name)
+    if state is None:
+        return None
+    return make_etag(request.get_full_path(), *state.values())
+
+
+def club_detail_last_modified(request, club_name):
+    state = club_detail_state(request, club_name=club_name)
+    if state is None:
+        return None
+    return max(state['updated_at'], state['head__updated_at'])
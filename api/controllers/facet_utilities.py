@@ -0,0 +1,25 @@
+from django.db.models import Count, F
+
+from api.controllers.tech_utilities import tech_counts
+
+
+def club_counts(queryset):
+    '''
+    Number of projects of the queryset in each club, largest first
+    '''
+    return list(
+        queryset.order_by()
+        .values('club', club_name=F('club__name'))
+        .annotate(count=Count('id'))
+        .order_by('-count', 'club_name')
+    )
+
+
+def project_facets(queryset):
+    '''
+    Counts of the queryset's projects per club and per technology
+    '''
+    return {
+        'clubs': club_counts(queryset),
+        'tech': tech_counts(queryset),
+    }
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import Count, OuterRef
+
+from api.controllers.serializers import club_serializer, project_serializer
+from api.models import Club, Project
+
+# Fields of the projects listed under each club
+RECENT_PROJECT_FIELDS = ['id', 'name', 'image', 'link', 'techstack']
+
+
+def recent_project_ids(limit):
+    '''
+    Ids of the latest projects of the outer club, newest first. Each club
+    reads only its first rows of the (club, created_at, id) index.
+    '''
+    recent = Project.objects.filter(club=OuterRef('pk')).order_by('-created_at', '-id').values('id')[:limit]
+    return ArraySubquery(recent)
+
+
+def homepage():
+    '''
+    Every club, by name, with its number of projects and its latest
+    projects. Runs two queries: the clubs with their counts and the ids of
+    their latest projects, then those projects.
+    '''
+    clubs = Club.objects.annotate(
+        project_count=Count('project'),
+        recent_ids=recent_project_ids(settings.HOMEPAGE_RECENT_PROJECTS)
+    ).order_by('name')
+    clubs, serialize_club = club_serializer.rows(clubs, extra=('project_count', 'recent_ids'))
+    clubs = list(clubs)
+
+    ids = [project_id for club in clubs for project_id in club.recent_ids]
+    projects, serialize_project = project_serializer.rows(Project.objects.filter(id__in=ids), RECENT_PROJECT_FIELDS)
+    projects = {project.id: serialize_project(project) for project in projects}
+
+    data = []
+    for club in clubs:
+        item = serialize_club(club)
+        item['project_count'] = club.project_count
+        item['projects'] = [projects[project_id] for project_id in club.recent_ids if project_id in projects]
+        data.append(item)
+    return data
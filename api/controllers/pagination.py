@@ -0,0 +1,149 @@
+import base64
+from bisect import bisect_left
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# Keys a listing is ordered and paginated by, newest first. Each key is
+# paired with the parser used to turn its cursor value back into a Python
+# value. The last key must be unique so that every row has a distinct
+# position.
+CREATED_KEYSET = (('created_at', parse_datetime), ('id', int))
+
+# Search results, best match first
+RANK_KEYSET = (('rank', float), ('id', int))
+
+# Results of the in-process search index, newest first
+ID_KEYSET = (('id', int),)
+
+
+def get_page_size(params):
+    '''
+    Reads the page size from the query params, clamped to the allowed range.
+    Raises ValueError if it is not an integer.
+    '''
+    page_size = params.get('page_size')
+    if page_size is None:
+        return settings.API_PAGE_SIZE
+    return max(1, min(int(page_size), settings.API_MAX_PAGE_SIZE))
+
+
+def encode_value(value):
+    # Unlike DjangoJSONEncoder, keep full microsecond precision, otherwise
+    # rows sharing the truncated timestamp would be skipped.
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError("Cannot encode {} in a cursor".format(type(value).__name__))
+
+
+def encode_cursor(values):
+    '''
+    Encodes the key values of the last row of a page into an opaque cursor
+    '''
+    raw = json.dumps(values, default=encode_value, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, keyset):
+    '''
+    Decodes a cursor produced by encode_cursor for the given keyset.
+    Raises ValueError if the cursor is malformed.
+    '''
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(keyset):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for (_, parse), value in zip(keyset, values):
+        try:
+            value = parse(value)
+        except (TypeError, ValueError):
+            value = None
+        if value is None:
+            raise ValueError("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def after_cursor(keyset, values):
+    '''
+    Builds the filter selecting rows strictly after the given key values
+    in descending keyset order, i.e.
+    (k1 < v1) OR (k1 = v1 AND k2 < v2) OR ...
+    '''
+    condition = Q()
+    equal = {}
+    for (key, _), value in zip(keyset, values):
+        condition |= Q(**equal, **{key + '__lt': value})
+        equal[key] = value
+    return condition
+
+
+def key_values(row, keyset):
+    if isinstance(row, dict):
+        return [row[key] for key, _ in keyset]
+    return [getattr(row, key) for key, _ in keyset]
+
+
+def paginate(queryset, params, keyset=CREATED_KEYSET):
+    '''
+    Returns one page of the queryset and the cursor of the next page (None
+    on the last page). The page is selected with a WHERE clause on the
+    keyset rather than an OFFSET, so every page costs the same to fetch.
+    Raises ValueError on an invalid cursor or page size.
+    '''
+    page_size = get_page_size(params)
+    queryset = queryset.order_by(*['-' + key for key, _ in keyset])
+
+    cursor = params.get('cursor')
+    if cursor:
+        queryset = queryset.filter(after_cursor(keyset, decode_cursor(cursor, keyset)))
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(key_values(rows[-1], keyset))
+    return rows, next_cursor
+
+
+def paginate_ids(ids, params):
+    '''
+    Same as paginate(), for a list of ids sorted in ascending order. Pages
+    run from the highest id down. Returns the ids of one page and the
+    cursor of the next page.
+    '''
+    page_size = get_page_size(params)
+
+    end = len(ids)
+    cursor = params.get('cursor')
+    if cursor:
+        end = bisect_left(ids, decode_cursor(cursor, ID_KEYSET)[0])
+
+    page = ids[max(0, end - page_size):end][::-1]
+    next_cursor = None
+    if end > page_size:
+        next_cursor = encode_cursor([page[-1]])
+    return page, next_cursor
+
+
+def stream_requested(params):
+    '''
+    Whether the client asked for the whole collection as a streamed response
+    '''
+    return params.get('stream', '').lower() in ('1', 'true')
+
+
+def stream(queryset, serialize):
+    '''
+    Lazily serializes every row of the queryset. Rows are read through a
+    server-side cursor, so only one chunk of them is in memory at a time.
+    '''
+    return (serialize(item) for item in queryset.iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE))
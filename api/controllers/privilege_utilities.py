@@ -0,0 +1,45 @@
+from django.db.models import F, FilteredRelation, Q
+
+from api.controllers.privileges import club_privileges, project_privileges
+from api.controllers.request_utilities import memoize_on_request
+from api.models import Club, Project
+
+# Guarded writes need both the club or project named in the request and
+# the privilege the user has in it. Both are read by a single query, the
+# object LEFT JOINed to the user's membership, whose privilege id is then
+# named through the privilege registry.
+
+
+def with_privilege(queryset, relation, user, privileges):
+    '''
+    First row of queryset, with access_privilege set to the name of the
+    privilege user has in it through the membership relation, or to None
+    if user is not a member. None if queryset is empty.
+    '''
+    row = queryset.annotate(
+        membership=FilteredRelation(relation, condition=Q(**{relation + '__user': user})),
+        access_privilege_id=F('membership__privilege'),
+    ).first()
+    if row is not None:
+        row.access_privilege = privileges.name(row.access_privilege_id)
+    return row
+
+
+@memoize_on_request
+def resolve_club(request, name):
+    '''
+    Club with the given name, with the access_privilege of the user of the
+    request, or None if there is no such club
+    '''
+    return with_privilege(Club.objects.filter(name=name), 'clubmemberrelationship', request.user, club_privileges)
+
+
+@memoize_on_request
+def resolve_project(request, name):
+    '''
+    Project with the given name, with the access_privilege of the user of
+    the request, or None if there is no such project
+    '''
+    return with_privilege(
+        Project.objects.filter(name=name), 'projectmemberrelationship', request.user, project_privileges
+    )
@@ -0,0 +1,67 @@
+from django.db import connections
+
+from api.models import ClubMemberPrivilege, ProjectMemberPrivilege
+
+# Both privilege models share the same codes
+VIEW = ClubMemberPrivilege.AvailablePrivileges.VIEW
+ADMIN = ClubMemberPrivilege.AvailablePrivileges.ADMIN
+
+
+class PrivilegeRegistry:
+    '''
+    Privilege rows of this process, keyed by their AvailablePrivileges code.
+    The rows are seeded by migration 0003 and do not change afterwards, so
+    they are read once, on first use, instead of being looked up by name
+    on every request. Memberships are then filtered on privilege_id.
+    '''
+
+    def __init__(self, model):
+        self.model = model
+        self.by_code = None
+        self.by_id = {}
+
+    def load(self):
+        privileges = list(self.model.objects.order_by('id'))
+        by_code = {}
+        for privilege in privileges:
+            by_code.setdefault(privilege.code, privilege)
+        self.by_id = {privilege.id: privilege for privilege in privileges}
+        self.by_code = by_code
+        return by_code
+
+    def rows(self):
+        if self.by_code is None:
+            return self.load()
+        return self.by_code
+
+    def get(self, code):
+        '''
+        Privilege row of the code, or None if it was not seeded
+        '''
+        return self.rows().get(code)
+
+    def id(self, code):
+        privilege = self.get(code)
+        return privilege.id if privilege is not None else None
+
+    def name(self, privilege_id):
+        '''
+        Name of the privilege with the given id, or None
+        '''
+        self.rows()
+        privilege = self.by_id.get(privilege_id)
+        return privilege.name if privilege is not None else None
+
+    def clear(self):
+        self.by_code = None
+        self.by_id = {}
+
+
+club_privileges = PrivilegeRegistry(ClubMemberPrivilege)
+project_privileges = PrivilegeRegistry(ProjectMemberPrivilege)
+
+
+def warm_up():
+    club_privileges.get(ADMIN)
+    project_privileges.get(ADMIN)
+    connections.close_all()
@@ -1,15 +1,17 @@
-from api.models import Project, ProjectMemberPrivilege, ProjectMemberRelationship, ProjectMember
+from api.controllers.privileges import ADMIN, project_privileges
+from api.models import Project, ProjectMemberRelationship, ProjectMember
 import logging
 
 logger = logging.getLogger(__name__)
 
-def create_project(name, abstract, link, head, uploaded_file_url, club, members=None, techstack=None):
+def create_project(name, abstract, link, head, uploaded_file_url, club, members=None, techstack=None, tech_tags=None):
     """
     Helper to create a project, assign project user relationships, and store techstack images.
+    tech_tags are the tags of the techstack images, see save_techstack.
     """
     try:
-        project_member_privilege = ProjectMemberPrivilege.objects.filter(name="Admin")
-        if project_member_privilege.exists():
+        project_member_privilege = project_privileges.get(ADMIN)
+        if project_member_privilege is not None:
             project = Project.objects.create(
                 name=name,
                 abstract=abstract,
@@ -17,12 +19,13 @@ def create_project(name, abstract, link, head, uploaded_file_url, club, members=
                 head=head,
                 image=uploaded_file_url,
                 club=club,
-                techstack=techstack or []
+                techstack=techstack or [],
+                tech_tags=tech_tags or []
             )
             ProjectMemberRelationship.objects.create(
                 project=project,
                 user=head,
-                privilege=project_member_privilege[0]
+                privilege=project_member_privilege
             )
             if members:
                 for member_data in members:
@@ -38,3 +41,48 @@ def create_project(name, abstract, link, head, uploaded_file_url, club, members=
     except Exception as e:
         logger.error(e)
         return False
+
+
+def project_detail_dict(project):
+    """
+    Detail payload of a project. Expects head to be select_related and
+    members to be prefetched.
+    """
+    return {
+        "id": project.id,
+        "name": project.name,
+        "email": project.head.email,
+        "abstract": project.abstract,
+        "link": project.link,
+        "image": project.image.url if project.image else None,
+        "techstack": project.techstack,
+        "members": [
+            {
+                "name": member.name,
+                "profile_pic": member.profile_pic.url if member.profile_pic else None
+            }
+            for member in project.members.all()
+        ]
+    }
+
+
+def project_detail(name):
+    """
+    Details of the project with the given name, or None if there is none.
+    Runs two queries: the project joined with its head through the name
+    index, then its members.
+    """
+    try:
+        project = Project.objects.select_related("head").prefetch_related("members").get(name=name)
+    except Project.DoesNotExist:
+        return None
+    return project_detail_dict(project)
+
+
+def project_details(lookup, values):
+    """
+    Details of the projects whose `lookup` field ("name" or "id") is one of
+    values, keyed by that field. Runs two queries for any number of values.
+    """
+    projects = Project.objects.select_related("head").prefetch_related("members").filter(**{lookup + "__in": values})
+    return {getattr(project, lookup): project_detail_dict(project) for project in projects}
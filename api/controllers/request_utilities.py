@@ -0,0 +1,17 @@
+from functools import wraps
+
+
+def memoize_on_request(func):
+    '''
+    Caches the result of func on the request for each set of arguments, so
+    that the decorators, conditional GET functions and view handling one
+    request share a single lookup.
+    '''
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        memo = request.__dict__.setdefault('_memoized', {})
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in memo:
+            memo[key] = func(request, *args, **kwargs)
+        return memo[key]
+    return wrapper
@@ -0,0 +1,355 @@
+import logging
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from api.controllers.cache_utilities import new_version
+from api.models import Club, Project
+
+logger = logging.getLogger(__name__)
+
+# In-process search index, used by the search views when SEARCH_BACKEND is
+# 'memory'. Each worker builds its own copy on first use. Writes are
+# published to the other workers through a change log in the shared cache,
+# from which each of them re-indexes just the changed rows on its next
+# search (see WorkerIndex).
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def fold(text):
+    '''
+    Lower cases text and strips accents, so that "Café" matches "cafe"
+    '''
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(*texts):
+    tokens = set()
+    for text in texts:
+        if text:
+            tokens.update(TOKEN_RE.findall(fold(text)))
+    return tokens
+
+
+class InvertedIndex:
+    '''
+    Maps every token to the sorted ids of the documents containing it.
+    Postings are arrays of 64-bit integers rather than lists or sets of
+    Python ints, and tokens are interned, so that every document holding a
+    token refers to one string. Both keep the index small.
+    '''
+
+    def __init__(self):
+        self.postings = {}
+        # All tokens, sorted, to find those starting with a prefix. None
+        # while the index is built in bulk.
+        self.tokens = []
+        # Tokens of each document, to take it out again on update
+        self.documents = {}
+        # Tokens whose posting this index may modify, None for all of them
+        self.owned = None
+
+    def copy(self):
+        '''
+        Copy of the index to update while this one is being searched. The
+        postings are shared and only copied once the copy modifies them.
+        '''
+        index = InvertedIndex()
+        index.postings = dict(self.postings)
+        index.tokens = list(self.tokens)
+        index.documents = dict(self.documents)
+        index.owned = set()
+        return index
+
+    def writable(self, token):
+        posting = self.postings[token]
+        if self.owned is not None and token not in self.owned:
+            posting = self.postings[token] = array('q', posting)
+            self.owned.add(token)
+        return posting
+
+    @contextmanager
+    def bulk(self):
+        '''
+        Documents added within are not inserted into the sorted tokens one
+        at a time, which moves every later token. The tokens are sorted once
+        at the end instead.
+        '''
+        self.tokens = None
+        try:
+            yield self
+        finally:
+            self.tokens = sorted(self.postings)
+
+    def add(self, doc_id, tokens):
+        self.remove(doc_id)
+        tokens = self.documents[doc_id] = tuple(sys.intern(token) for token in tokens)
+        for token in tokens:
+            if token in self.postings:
+                posting = self.writable(token)
+            else:
+                posting = self.postings[token] = array('q')
+                if self.owned is not None:
+                    self.owned.add(token)
+                if self.tokens is not None:
+                    insort(self.tokens, token)
+            posting.insert(bisect_left(posting, doc_id), doc_id)
+
+    def remove(self, doc_id):
+        for token in self.documents.pop(doc_id, ()):
+            posting = self.writable(token)
+            del posting[bisect_left(posting, doc_id)]
+            if not posting:
+                del self.postings[token]
+                if self.tokens is not None:
+                    del self.tokens[bisect_left(self.tokens, token)]
+
+    def prefix_matches(self, prefix):
+        '''
+        Ids of the documents containing a token that starts with prefix
+        '''
+        start = bisect_left(self.tokens, prefix)
+        postings = []
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            postings.append(self.postings[token])
+        if len(postings) == 1:
+            return set(postings[0])
+        return set().union(*postings)
+
+    def search(self, text):
+        '''
+        Ids of the documents matching every word of text as a prefix, in
+        ascending order
+        '''
+        words = sorted(tokenize(text), key=len, reverse=True)
+        if not words:
+            return []
+
+        # Longest words first, they usually narrow the result down fastest
+        ids = self.prefix_matches(words[0])
+        for word in words[1:]:
+            if not ids:
+                break
+            ids &= self.prefix_matches(word)
+        return sorted(ids)
+
+
+def project_tokens(name, abstract, club_name, head_name, tech_tags):
+    return tokenize(name, abstract, club_name, head_name, *tech_tags)
+
+
+def club_tokens(name, abstract, head_name):
+    return tokenize(name, abstract, head_name)
+
+
+class WorkerIndex:
+    '''
+    Data held by each worker and kept in step with the database.
+    Subclasses implement build(), reading the data from the database, and
+    apply(data, **ids), returning a copy of data with the given rows
+    re-indexed.
+
+    Published data is never modified: writes build a new copy and swap it
+    in, so searches read current() once and use it without locking.
+
+    Every write is recorded in the shared cache under the next number of a
+    sequence. A worker behind the sequence applies the writes it missed,
+    and only rebuilds everything if some of them are gone from the cache.
+    '''
+    version_name = None
+
+    # Writes a worker catches up with before it rebuilds instead
+    MAX_CATCH_UP = 100
+
+    # Attempts at claiming a number of the sequence for a write
+    PUBLISH_ATTEMPTS = 5
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.data = None
+
+    def build(self):
+        raise NotImplementedError
+
+    def apply(self, data, **ids):
+        raise NotImplementedError
+
+    def sequence_key(self):
+        return 'worker_index:{}'.format(self.version_name)
+
+    def change_key(self, version):
+        return 'worker_index:{}:{}'.format(self.version_name, version)
+
+    def latest(self):
+        '''
+        Number of the last write to the data
+        '''
+        version = cache.get(self.sequence_key())
+        if version is None:
+            # Lost or never set. A new start makes every worker rebuild.
+            cache.add(self.sequence_key(), new_version(), timeout=None)
+            version = cache.get(self.sequence_key())
+        return version
+
+    def publish(self, ids):
+        '''
+        Records a write for the other workers. Returns its number.
+        '''
+        for _ in range(self.PUBLISH_ATTEMPTS):
+            try:
+                version = cache.incr(self.sequence_key())
+            except ValueError:
+                version = self.latest()
+                continue
+            # incr is not atomic on every cache backend, two writes may get
+            # the same number. Only one of them can claim it.
+            if cache.add(self.change_key(version), ids):
+                return version
+        version = new_version()
+        cache.set(self.sequence_key(), version, timeout=None)
+        return version
+
+    def changes(self, version):
+        '''
+        Ids of the rows written to since version, or None if some of the
+        writes are no longer known
+        '''
+        latest = self.latest()
+        if not 0 < latest - version <= self.MAX_CATCH_UP:
+            return None
+        keys = [self.change_key(number) for number in range(version + 1, latest + 1)]
+        found = cache.get_many(keys)
+        if len(found) != len(keys):
+            return None
+        ids = {}
+        for change in found.values():
+            for name, values in change.items():
+                ids.setdefault(name, set()).update(values)
+        return ids
+
+    def current(self):
+        '''
+        Returns the data, first catching up with the writes of other workers
+        '''
+        latest = self.latest()
+        if self.data is not None and latest == self.version:
+            return self.data
+        # Searches made while another thread catches up use the data as it is
+        if not self.lock.acquire(blocking=self.data is None):
+            return self.data
+        try:
+            latest = self.latest()
+            if self.data is None or latest != self.version:
+                ids = self.changes(self.version) if self.data is not None else None
+                self.data = self.build() if ids is None else self.apply(self.data, **ids)
+                self.version = latest
+        finally:
+            self.lock.release()
+        return self.data
+
+    def update(self, **ids):
+        '''
+        Re-indexes the given rows after a write and records the write for
+        the other workers. Ids that no longer exist are removed.
+        '''
+        ids = {name: list(values) for name, values in ids.items()}
+        with self.lock:
+            version = self.publish(ids)
+            # Behind on other writes, current() applies this one with them
+            if self.data is not None and version == self.version + 1:
+                self.data = self.apply(self.data, **ids)
+                self.version = version
+
+
+SearchData = namedtuple('SearchData', ['projects', 'tech', 'clubs'])
+
+
+class SearchIndex(WorkerIndex):
+    '''
+    The project and club indexes of this worker, along with the tech tags
+    of projects for the ?tech= filter
+    '''
+    version_name = 'search_index'
+
+    def index_projects(self, projects, tech, queryset):
+        rows = queryset.values_list('id', 'name', 'abstract', 'club__name', 'head__name', 'tech_tags')
+        for doc_id, *fields in rows.iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE):
+            projects.add(doc_id, project_tokens(*fields))
+            tech.add(doc_id, fields[-1])
+
+    def index_clubs(self, clubs, queryset):
+        rows = queryset.values_list('id', 'name', 'abstract', 'head__name')
+        for doc_id, *fields in rows.iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE):
+            clubs.add(doc_id, club_tokens(*fields))
+
+    def build(self):
+        data = SearchData(InvertedIndex(), InvertedIndex(), InvertedIndex())
+        with data.projects.bulk(), data.tech.bulk(), data.clubs.bulk():
+            self.index_projects(data.projects, data.tech, Project.objects.all())
+            self.index_clubs(data.clubs, Club.objects.all())
+        logger.info('Search index built: {} projects, {} clubs'.format(len(data.projects.documents), len(data.clubs.documents)))
+        return data
+
+    def apply(self, data, project_ids=(), club_ids=()):
+        data = SearchData(data.projects.copy(), data.tech.copy(), data.clubs.copy())
+        for doc_id in project_ids:
+            data.projects.remove(doc_id)
+            data.tech.remove(doc_id)
+        for doc_id in club_ids:
+            data.clubs.remove(doc_id)
+        self.index_projects(data.projects, data.tech, Project.objects.filter(id__in=project_ids))
+        self.index_clubs(data.clubs, Club.objects.filter(id__in=club_ids))
+        return data
+
+    def search_projects(self, text, tech=None):
+        '''
+        Ids of the projects matching text, restricted to those using every
+        one of the tech tags if given
+        '''
+        data = self.current()
+        ids = data.projects.search(text)
+        if tech:
+            ids = sorted(set(ids).intersection(*[data.tech.postings.get(tag, ()) for tag in tech]))
+        return ids
+
+    def search_clubs(self, text):
+        return self.current().clubs.search(text)
+
+
+search_index = SearchIndex()
+
+
+def memory_search_enabled():
+    return settings.SEARCH_BACKEND == 'memory'
+
+
+def warm_up():
+    '''
+    Builds the index of this worker ahead of its first search
+    '''
+    if memory_search_enabled():
+        search_index.current()
+        connections.close_all()
+
+
+def in_order(rows, ids):
+    '''
+    Orders rows fetched with id__in=ids like ids, skipping rows deleted in
+    the meantime
+    '''
+    by_id = {row.id: row for row in rows}
+    return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
@@ -0,0 +1,168 @@
+import re
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Func, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Cast, Greatest
+
+from api.models import Club, Project, User
+
+
+class Unaccent(Func):
+    function = 'unaccent'
+    output_field = TextField()
+
+
+def weighted(field, weight):
+    return SearchVector(Unaccent(field), weight=weight, config=settings.SEARCH_CONFIG)
+
+
+def project_vector():
+    '''
+    Search document of a project: its name ranks highest, then the names of
+    its club and head, then the abstract
+    '''
+    return (
+        weighted('name', 'A')
+        + weighted('club__name', 'B')
+        + weighted('head__name', 'B')
+        + weighted('abstract', 'C')
+    )
+
+
+def club_vector():
+    return weighted('name', 'A') + weighted('head__name', 'B') + weighted('abstract', 'C')
+
+
+def refresh_search_vectors(queryset, vector):
+    '''
+    Recomputes the stored search vector of every row in the queryset with a
+    single UPDATE. Vectors pull in related names, so callers refresh the
+    rows of related models as well when a name changes.
+    '''
+    model = queryset.model
+    document = model.objects.filter(pk=OuterRef('pk')).order_by().annotate(document=vector).values('document')
+    queryset.update(search_vector=Subquery(document[:1]))
+
+
+def refresh_projects(queryset):
+    refresh_search_vectors(queryset, project_vector())
+
+
+def refresh_clubs(queryset):
+    refresh_search_vectors(queryset, club_vector())
+
+
+def to_search_query(text):
+    '''
+    Turns user input into a tsquery matching every word as a prefix, so that
+    results show up while a word is still being typed. Returns None if the
+    input has no words.
+    '''
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    raw = ' & '.join(word + ':*' for word in words)
+    return SearchQuery(Unaccent(Value(raw)), search_type='raw', config=settings.SEARCH_CONFIG)
+
+
+def ranked_search(queryset, text):
+    '''
+    Filters the queryset down to rows matching text through the GIN indexed
+    search vector, annotated with their rank. The rank is cast to double
+    precision so that it survives the round trip through a page cursor.
+    '''
+    query = to_search_query(text)
+    if query is None:
+        return queryset.none()
+    return queryset.filter(search_vector=query).annotate(
+        rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+    )
+
+
+def search_projects(text):
+    return ranked_search(Project.objects.all(), text)
+
+
+def search_clubs(text):
+    return ranked_search(Club.objects.all(), text)
+
+
+def parse_threshold(params):
+    '''
+    Reads the similarity threshold of fuzzy search from the query params.
+    Raises ValueError if it is not a number in (0, 1].
+    '''
+    threshold = float(params.get('threshold', settings.SEARCH_TRIGRAM_THRESHOLD))
+    if not 0 < threshold <= 1:
+        raise ValueError("Invalid threshold")
+    return threshold
+
+
+@contextmanager
+def similarity_threshold(threshold):
+    '''
+    Sets the threshold of the trigram word similarity operator (<%) for the
+    queries run inside the block. Filtering with the operator rather than
+    comparing the similarity lets Postgres use the trigram GIN indexes.
+    '''
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(threshold)])
+        yield
+
+
+def similarity(text, *fields):
+    '''
+    Best word similarity of text to any of the fields, as double precision
+    so it can be used in a page cursor
+    '''
+    scores = [TrigramWordSimilarity(text, field) for field in fields]
+    score = Greatest(*scores) if len(scores) > 1 else scores[0]
+    return Cast(score, FloatField())
+
+
+def fuzzy_search_projects(text):
+    '''
+    Projects whose name, club name or head name is similar to text, most
+    similar first. Each name is matched against its own trigram index.
+    Must be evaluated inside similarity_threshold().
+    '''
+    return Project.objects.filter(
+        Q(name__trigram_word_similar=text)
+        | Q(club__in=Club.objects.filter(name__trigram_word_similar=text))
+        | Q(head__in=User.objects.filter(name__trigram_word_similar=text))
+    ).annotate(rank=similarity(text, 'name', 'club__name', 'head__name'))
+
+
+def fuzzy_search_clubs(text):
+    '''
+    Clubs whose name or head name is similar to text, most similar first.
+    Must be evaluated inside similarity_threshold().
+    '''
+    return Club.objects.filter(
+        Q(name__trigram_word_similar=text)
+        | Q(head__in=User.objects.filter(name__trigram_word_similar=text))
+    ).annotate(rank=similarity(text, 'name', 'head__name'))
+
+
+def mode_search(params, fulltext, fuzzy):
+    '''
+    Runs the search selected by ?mode= (fulltext by default) for ?query=.
+    Returns the ranked queryset and the context its queries must be
+    evaluated in. Raises ValueError with the message to return on an
+    invalid mode or threshold.
+    '''
+    query = params.get('query')
+    mode = params.get('mode', 'fulltext')
+    if mode == 'fulltext':
+        return fulltext(query), nullcontext()
+    if mode == 'fuzzy':
+        try:
+            threshold = parse_threshold(params)
+        except ValueError:
+            raise ValueError("Invalid threshold")
+        return fuzzy(query), similarity_threshold(threshold)
+    raise ValueError("Invalid search mode")
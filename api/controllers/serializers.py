@@ -0,0 +1,116 @@
+from operator import itemgetter
+
+from django.core.files.storage import default_storage
+
+# Fields of each model's payload, mapped to the ORM lookup each one is read
+# from. The order is the order of keys in the payload. These also act as
+# the whitelists for ?fields=.
+PROJECT_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'abstract': 'abstract',
+    'image': 'image',
+    'link': 'link',
+    'club': 'club',
+    'head': 'head',
+    'techstack': 'techstack',
+    'club_name': 'club__name',
+}
+
+CLUB_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'abstract': 'abstract',
+    'link': 'link',
+    'image': 'image',
+    'head': 'head',
+}
+
+# Fields stored as file names that are returned as URLs
+FILE_FIELDS = {'image'}
+
+# Always read so that pages of rows can still be keyset paginated
+KEYSET_LOOKUPS = ('created_at', 'id')
+
+
+def file_url(name):
+    return default_storage.url(name) if name else None
+
+
+def parse_fields(params, whitelist):
+    '''
+    Returns the fields requested with ?fields=a,b,c, once each and in the
+    order of the whitelist, or None if the param is absent. Raises
+    ValueError if a field is not in the whitelist.
+    '''
+    fields = params.get('fields')
+    if fields is None:
+        return None
+
+    fields = {field.strip() for field in fields.split(',')} - {''}
+    if not fields or any(field not in whitelist for field in fields):
+        raise ValueError("Invalid fields")
+    return [field for field in whitelist if field in fields]
+
+
+class Serializer:
+    '''
+    Serializes rows of a model straight from values_list() tuples, without
+    building model instances or walking _meta for every row.
+
+    For each set of requested fields a plan (the columns to select and a
+    function turning a row into the payload) is built once and reused.
+    Plans are keyed on the fields in the order of the spec, so there is at
+    most one per subset of it, whatever order they were requested in.
+    '''
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.plans = {}
+
+    def compile(self, fields, extra):
+        lookups = list(KEYSET_LOOKUPS) + list(extra)
+        for field in fields:
+            if self.spec[field] not in lookups:
+                lookups.append(self.spec[field])
+
+        names = tuple(fields)
+        getter = itemgetter(*[lookups.index(self.spec[field]) for field in fields])
+        if len(fields) == 1:
+            # itemgetter with a single index returns the value, not a tuple
+            single = getter
+            getter = lambda row: (single(row),)
+        files = [field for field in fields if field in FILE_FIELDS]
+
+        def serialize(row):
+            item = dict(zip(names, getter(row)))
+            for field in files:
+                item[field] = file_url(item[field])
+            return item
+
+        return lookups, serialize
+
+    def plan(self, fields=None, extra=()):
+        fields = set(fields or self.spec)
+        key = (tuple(field for field in self.spec if field in fields), tuple(extra))
+        if key not in self.plans:
+            self.plans[key] = self.compile(*key)
+        return self.plans[key]
+
+    def rows(self, queryset, fields=None, extra=()):
+        '''
+        Restricts the queryset to the columns backing the requested fields
+        (all of them by default). Annotations listed in extra are selected
+        as well, e.g. to paginate on them. Returns the values_list queryset
+        along with the function serializing its rows.
+        '''
+        lookups, serialize = self.plan(fields, extra)
+        return queryset.values_list(*lookups, named=True), serialize
+
+    def serialize(self, queryset, fields=None):
+        queryset, serialize = self.rows(queryset, fields)
+        return [serialize(row) for row in queryset]
+
+
+project_serializer = Serializer(PROJECT_FIELDS)
+club_serializer = Serializer(CLUB_FIELDS)
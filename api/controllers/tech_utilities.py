@@ -0,0 +1,93 @@
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+
+from api.controllers.search_index import fold
+from api.models import Project
+
+# Techstack entries are paths of uploaded logos, e.g. /media/React_logo.png.
+# Each logo is reduced to a tag like "react", stored in Project.tech_tags,
+# which the ?tech= filter matches through a GIN index. Tags are taken from
+# the name the logo was uploaded with: the stored name has lost characters
+# like the + of C++ and may carry a random suffix added by the storage.
+
+# Words naming the kind of image rather than the technology
+IMAGE_WORDS = {'logo', 'icon', 'img', 'image'}
+
+
+def normalize_tech(name):
+    '''
+    Tag of a technology name: folded, with words joined by dashes. Trailing
+    + and # are kept, so that C, C++ and C# stay apart.
+    '''
+    words = [word for word in re.findall(r'[^\W_]+[+#]*', fold(name)) if word not in IMAGE_WORDS]
+    return '-'.join(words)
+
+
+def tech_tag(file_name):
+    return normalize_tech(os.path.splitext(os.path.basename(file_name))[0])
+
+
+def tech_tags(file_names):
+    '''
+    Distinct tags of the uploaded logo names, in their order
+    '''
+    tags = []
+    for file_name in file_names:
+        tag = tech_tag(file_name)
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def save_techstack(files):
+    '''
+    Stores the uploaded logos. Returns the techstack, their urls, and the
+    tags of the names they were uploaded with.
+    '''
+    fs = FileSystemStorage()
+    techstack = [fs.url(fs.save(tech_file.name, tech_file)) for tech_file in files]
+    return techstack, tech_tags(tech_file.name for tech_file in files)
+
+
+def parse_tech(params):
+    '''
+    Reads the tags of ?tech=react,django, or None if the param is absent.
+    Raises ValueError if no tag is given. A + has to be sent as %2B, as in
+    ?tech=c%2B%2B.
+    '''
+    tech = params.get('tech')
+    if tech is None:
+        return None
+    tags = {normalize_tech(name) for name in tech.split(',')} - {''}
+    if not tags:
+        raise ValueError("Invalid tech")
+    return sorted(tags)
+
+
+def filter_tech(queryset, tags):
+    '''
+    Projects using every one of the tags. Containment (@>) is answered by
+    the GIN index on tech_tags.
+    '''
+    if tags is None:
+        return queryset
+    return queryset.filter(tech_tags__contains=tags)
+
+
+def tech_counts(queryset):
+    '''
+    Number of projects of the queryset using each tag, most used first
+    '''
+    projects, params = queryset.order_by().values('id').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT tag, COUNT(*) FROM {table}, jsonb_array_elements_text({table}.tech_tags) AS tag '
+            'WHERE {table}.id IN ({projects}) GROUP BY tag ORDER BY COUNT(*) DESC, tag'.format(
+                table=Project._meta.db_table, projects=projects
+            ),
+            params
+        )
+        return [{'tech': tag, 'count': count} for tag, count in cursor.fetchall()]
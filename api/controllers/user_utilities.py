@@ -1,7 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email as _validate_email
-from django.contrib.sessions.models import Session
 from api.models import User
+from api.sessions import SessionStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,15 +28,10 @@ def register_user(email, name, password, uploaded_file_url, is_admin):
 
 def remove_existing_sessions(user_id):
     """
-    Removes sessions on other devices for the giver user_id
+    Removes sessions on other devices for the giver user_id, through the
+    index on the session's user
     """
-    sessions = Session.objects.all()
-
-    for session in sessions:
-        data = session.get_decoded()
-        if data.get('user_id', -1) == user_id:
-            # Already a session exist, delete it
-            session.delete()
+    SessionStore.delete_user_sessions(user_id)
     logger.info('User(pk={}) Existing sessions deleted'.format(user_id))
     return
 
@@ -1,7 +1,7 @@
 import logging
-from django.contrib.sessions.models import Session
 from api.controllers.response_format import unauthorized_response, error_response
-from api.models import User, Club, ClubMemberRelationship, ClubMemberPrivilege
+from api.controllers.privilege_utilities import resolve_club
+from api.sessions import session_user
 from django.http import HttpRequest
 logger = logging.getLogger('django')
 
@@ -14,11 +14,8 @@ def IsAdminDec(view):
         try:
             request = args[0]
             assert isinstance(request, HttpRequest)
-            user_id = request.session.get('user_id')
-            session_key = request.session.session_key
-            user_session = Session.objects.get(pk=session_key)
-            assert user_session.get_decoded().get('user_id') == user_id
-            user = request.user
+            user = session_user(request)
+            assert user is not None
             if user.is_admin:
                 request.is_admin = True
             else:
@@ -38,24 +35,20 @@ def CheckAccessPrivilegeDec(view):
         try:
             request = args[0]
             assert isinstance(request, HttpRequest)
-            user_id = request.session.get('user_id')
-            session_key = request.session.session_key
-            user_session = Session.objects.get(pk=session_key)
-            assert user_session.get_decoded().get('user_id') == user_id
-            user = request.user
+            user = session_user(request)
+            assert user is not None
             name = request.POST.get("name")
 
-            try:
-                club = Club.objects.get(name=name)
-            except Club.DoesNotExist:
+            # One query for the club and the user's privilege in it, kept on
+            # the request so that the view does not fetch the club again
+            club = resolve_club(request, name)
+            if club is None:
                 return error_response("Club does not exist")
-
-            try:
-                club_member_relationship = ClubMemberRelationship.objects.get(user=user,club=club)
-            except ClubMemberRelationship.DoesNotExist:
+            if club.access_privilege is None:
                 return error_response("User is not a member of the club")
 
-            request.access_privilege = club_member_relationship.privilege.name
+            request.club = club
+            request.access_privilege = club.access_privilege
 
         except Exception as e:
             logger.info('CheckAccessPrivilege Decorator: Unauthorized response')
@@ -1,7 +1,7 @@
 import logging
-from django.contrib.sessions.models import Session
 from api.controllers.response_format import unauthorized_response, error_response
-from api.models import User, Project, ProjectMemberRelationship, ProjectMemberPrivilege
+from api.controllers.privilege_utilities import resolve_project
+from api.sessions import session_user
 from django.http import HttpRequest
 logger = logging.getLogger('django')
 
@@ -14,11 +14,8 @@ def IsAdminDec(view):
         try:
             request = args[0]
             assert isinstance(request, HttpRequest)
-            user_id = request.session.get('user_id')
-            session_key = request.session.session_key
-            user_session = Session.objects.get(pk=session_key)
-            assert user_session.get_decoded().get('user_id') == user_id
-            user = request.user
+            user = session_user(request)
+            assert user is not None
             if user.is_admin:
                 request.is_admin = True
             else:
@@ -38,24 +35,20 @@ def CheckAccessPrivilegeDec(view):
         try:
             request = args[0]
             assert isinstance(request, HttpRequest)
-            user_id = request.session.get('user_id')
-            session_key = request.session.session_key
-            user_session = Session.objects.get(pk=session_key)
-            assert user_session.get_decoded().get('user_id') == user_id
-            user = request.user
+            user = session_user(request)
+            assert user is not None
             name = request.POST.get("name")
 
-            try:
-                project = Project.objects.get(name=name)
-            except Project.DoesNotExist:
+            # One query for the project and the user's privilege in it, kept on
+            # the request so that the view does not fetch the project again
+            project = resolve_project(request, name)
+            if project is None:
                 return error_response("Project does not exist")
-
-            try:
-                project_member_relationship = ProjectMemberRelationship.objects.get(user=user,project=project)
-            except ProjectMemberRelationship.DoesNotExist:
+            if project.access_privilege is None:
                 return error_response("User is not a member of the project")
 
-            request.access_privilege = project_member_relationship.privilege.name
+            request.project = project
+            request.access_privilege = project.access_privilege
 
         except Exception as e:
             logger.info('CheckAccessPrivilege Decorator: Unauthorized response')
@@ -1,7 +1,13 @@
 import logging
+from collections.abc import Iterator
 
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_vary_headers
+
+from api.controllers.compression import negotiate, precompress
 
 logger = logging.getLogger('django')
 
@@ -50,20 +56,110 @@ def regularize_response(response):
 
     return response
 
+def stream_response(response):
+    '''
+    Yields the JSON envelope of a response whose data is an iterator, encoding
+    the items of data one at a time so the full list is never held in memory.
+    Output is buffered into chunks of roughly API_STREAM_BUFFER_SIZE characters.
+    '''
+    encoder = DjangoJSONEncoder()
+    envelope = {key: value for key, value in response.items() if key != 'data'}
+
+    # Everything but the closing brace of the envelope, followed by the data key
+    buffer = [encoder.encode(envelope)[:-1], ', "data": [']
+    buffered = 0
+    try:
+        for index, item in enumerate(response['data']):
+            chunk = encoder.encode(item)
+            buffer.append(', ' + chunk if index else chunk)
+            buffered += len(chunk)
+            if buffered >= settings.API_STREAM_BUFFER_SIZE:
+                yield ''.join(buffer)
+                buffer = []
+                buffered = 0
+    except Exception as e:
+        # Headers are already sent, so the status cannot change anymore.
+        # The client receives a truncated body.
+        logger.error("JsonResponseDecorator: streaming failed: {}".format(e))
+        raise
+    buffer.append(']}')
+    yield ''.join(buffer)
+
+
+def render_view(view, *args, **kwargs):
+    '''
+    Runs the view and returns its regularized response dictionary
+    '''
+    try:
+        response = view(*args, **kwargs)
+    except Exception as e:
+        logger.error("JsonResponseDecorator: {}".format(e))
+        response = exception_response(e)
+
+    return regularize_response(response)
+
+
+def to_http_response(response):
+    if isinstance(response.get('data'), Iterator):
+        return StreamingHttpResponse(stream_response(response), content_type='application/json')
+    return JsonResponse(response)
+
+
 def JsonResponseDec(view):
     '''
     Converts any data returned by a function into a JSON Response format.
+    If the view returns an iterator under data (e.g. a generator over
+    queryset.iterator()), the response is streamed instead.
     '''
 
     def wrapper(*args, **kwargs):
+        return to_http_response(render_view(view, *args, **kwargs))
+    # logger.info('JsonResponseDecorator: Successful')
+    return wrapper
 
-        try:
-            response = view(*args, **kwargs)
-        except Exception as e:
-            logger.error("JsonResponseDecorator: {}".format(e))
-            response = exception_response(e)
 
-        response = regularize_response(response)
-        return JsonResponse(response)
-    # logger.info('JsonResponseDecorator: Successful')
-    return wrapper
\ No newline at end of file
+def encoded_response(request, variants):
+    '''
+    Builds the response from pre-encoded bodies, picking the encoding the
+    client prefers among those available
+    '''
+    encoding = negotiate(request)
+    if encoding not in variants:
+        encoding = None
+
+    response = HttpResponse(variants[encoding], content_type='application/json')
+    if len(variants) > 1:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def CachedJsonResponseDec(key_func):
+    '''
+    Same as JsonResponseDec, but successful responses are cached under the
+    key returned by key_func(request, *args, **kwargs), and served from the
+    cache without calling the view while the key stays the same.
+    The body is cached along with its compressed variants, so hot responses
+    are compressed once rather than on every request.
+    Streamed responses are never cached.
+    '''
+
+    def decorator(view):
+        def wrapper(*args, **kwargs):
+            request = args[0]
+            key = key_func(*args, **kwargs)
+            variants = cache.get(key)
+            if variants is not None:
+                return encoded_response(request, variants)
+
+            response = render_view(view, *args, **kwargs)
+            http_response = to_http_response(response)
+            if response['status_code'] != 200 or http_response.streaming:
+                return http_response
+
+            variants = precompress(http_response.content)
+            cache.set(key, variants)
+            return encoded_response(request, variants)
+        return wrapper
+    return decorator
@@ -0,0 +1,125 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.controllers.privileges import ADMIN, VIEW, club_privileges
+from api.models import Club, ClubMemberPrivilege, ClubMemberRelationship, User
+
+
+def access_check(club_id, user_id):
+    '''
+    Membership lookup of the access checks
+    '''
+    return list(ClubMemberRelationship.objects.filter(club_id=club_id, user_id=user_id).values('privilege_id'))
+
+
+def admin_clubs(club_id, user_id):
+    '''
+    Clubs a user is an admin of, as on the dashboards
+    '''
+    return list(ClubMemberRelationship.objects.filter(user_id=user_id, privilege_id=club_privileges.id(ADMIN)).values('club_id'))
+
+
+def club_admins(club_id, user_id):
+    '''
+    Admins of a club, as on the dashboards and admin panel
+    '''
+    return list(ClubMemberRelationship.objects.filter(club_id=club_id, privilege_id=club_privileges.id(ADMIN)).values('user_id'))
+
+
+QUERIES = (access_check, admin_clubs, club_admins)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the membership lookups of the access checks, dashboards and "
+        "admin panel without and with the membership indexes of migration "
+        "0011, and prints their query plans. Seeds users, clubs and "
+        "memberships inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clubs', type=int, default=5000)
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--memberships', type=int, default=100000)
+        parser.add_argument('--lookups', type=int, default=200, help="Lookups timed for each query")
+
+    def seed(self, clubs, users, memberships):
+        password = make_password(None)
+        User.objects.bulk_create([
+            User(email="bench{}@nitt.edu".format(i), name="Benchmark", password=password)
+            for i in range(users)
+        ], batch_size=5000)
+        user_ids = list(User.objects.filter(email__startswith="bench").values_list('id', flat=True))
+
+        Club.objects.bulk_create([
+            Club(name="Bench {}".format(i), abstract="Benchmark", link="https://example.com", head_id=user_ids[i % users])
+            for i in range(clubs)
+        ], batch_size=5000)
+        club_ids = list(Club.objects.filter(name__startswith="Bench ").values_list('id', flat=True))
+
+        admin = ClubMemberPrivilege.objects.get_or_create(code=ADMIN, defaults={'name': "Admin"})[0]
+        view = ClubMemberPrivilege.objects.get_or_create(code=VIEW, defaults={'name': "View"})[0]
+        # Distinct (club, user) pairs, one in ten of them admins
+        pairs = random.sample(range(len(club_ids) * len(user_ids)), min(memberships, len(club_ids) * len(user_ids)))
+        ClubMemberRelationship.objects.bulk_create([
+            ClubMemberRelationship(
+                club_id=club_ids[pair // len(user_ids)],
+                user_id=user_ids[pair % len(user_ids)],
+                privilege=admin if i % 10 == 0 else view,
+            )
+            for i, pair in enumerate(pairs)
+        ], batch_size=5000)
+        return list(ClubMemberRelationship.objects.values_list('club_id', 'user_id'))
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE {}'.format(ClubMemberRelationship._meta.db_table))
+
+    def time_query(self, query, pairs):
+        started = time.perf_counter()
+        for club_id, user_id in pairs:
+            query(club_id, user_id)
+        return (time.perf_counter() - started) / len(pairs)
+
+    def run(self, label, pairs):
+        self.analyze()
+        timings = {query.__name__: self.time_query(query, pairs) for query in QUERIES}
+        self.stdout.write("-- {}".format(label))
+        for name, timing in timings.items():
+            self.stdout.write("{:>14} {:>10.3f} ms/lookup".format(name, timing * 1e3))
+        club_id, user_id = pairs[0]
+        self.stdout.write(ClubMemberRelationship.objects.filter(club_id=club_id, user_id=user_id).explain())
+        self.stdout.write(ClubMemberRelationship.objects.filter(user_id=user_id, privilege_id=club_privileges.id(ADMIN)).explain())
+        return timings
+
+    def handle(self, *args, **options):
+        meta = ClubMemberRelationship._meta
+        with transaction.atomic():
+            memberships = self.seed(options['clubs'], options['users'], options['memberships'])
+            pairs = random.sample(memberships, min(options['lookups'], len(memberships)))
+            self.stdout.write("{} memberships of {} clubs".format(len(memberships), options['clubs']))
+
+            # Dropped and added back inside the transaction, which is rolled
+            # back in the end
+            with connection.schema_editor(atomic=False) as schema_editor:
+                for constraint in meta.constraints:
+                    schema_editor.remove_constraint(ClubMemberRelationship, constraint)
+                for index in meta.indexes:
+                    schema_editor.remove_index(ClubMemberRelationship, index)
+            before = self.run("without the membership indexes", pairs)
+
+            with connection.schema_editor(atomic=False) as schema_editor:
+                for index in meta.indexes:
+                    schema_editor.add_index(ClubMemberRelationship, index)
+                for constraint in meta.constraints:
+                    schema_editor.add_constraint(ClubMemberRelationship, constraint)
+            after = self.run("with the membership indexes", pairs)
+
+            for name in before:
+                self.stdout.write("{:>14} {:>10.1f}x".format(name, before[name] / after[name]))
+
+            transaction.set_rollback(True)
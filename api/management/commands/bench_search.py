@@ -0,0 +1,116 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api.controllers.search_utilities import (
+    fuzzy_search_projects, refresh_projects, search_projects, similarity_threshold
+)
+from api.models import Club, Project, User
+
+WORDS = (
+    "robotics aerospace autonomous drone rover satellite compiler quantum neural vision "
+    "speech blockchain solar battery electric vehicle hydroponics bridge concrete sensor "
+    "embedded wireless network security cryptography genome protein chemistry turbine "
+    "rocket glider submarine prosthetic exoskeleton wearable gesture holographic acoustic"
+).split()
+
+FIRST_NAMES = "Aarav Vivaan Aditya Diya Ananya Ishaan Kavya Rohan Saanvi Arjun Meera Karthik".split()
+LAST_NAMES = "Sharma Iyer Reddy Nair Gupta Menon Rao Pillai Das Kumar Singh Krishnan".split()
+
+
+def typo(word, rng):
+    '''Swaps two neighbouring letters, like a hurried student would'''
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the latency of the old unaccent__icontains project search with "
+        "full text and fuzzy (trigram) search. Requires Postgres. Seeds projects "
+        "inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=50000)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--threshold', type=float, default=0.5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def seed(self, rng, count):
+        users = User.objects.bulk_create([
+            User(email="bench{}@nitt.edu".format(i), name="{} {}".format(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)))
+            for i in range(max(count // 10, 1))
+        ])
+        clubs = Club.objects.bulk_create([
+            Club(name="{} club {}".format(rng.choice(WORDS).title(), i), abstract="", link="", head=rng.choice(users))
+            for i in range(max(count // 500, 1))
+        ])
+        Project.objects.bulk_create([
+            Project(
+                name=" ".join(rng.sample(WORDS, 3)).title() + " {}".format(i),
+                abstract=" ".join(rng.choices(WORDS, k=80)),
+                link="",
+                club=rng.choice(clubs),
+                head=rng.choice(users),
+            )
+            for i in range(count)
+        ], batch_size=5000)
+        # bulk_create sends no signals
+        refresh_projects(Project.objects.all())
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_project, api_club, api_user")
+
+    def timed(self, run, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stderr.write("This benchmark needs Postgres")
+            return
+
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self.seed(rng, options['projects'])
+
+            queries = [rng.choice(WORDS) for _ in range(options['queries'])]
+            typos = [typo(query, rng) for query in queries]
+
+            def icontains(query):
+                list(Project.objects.filter(
+                    Q(head__name__unaccent__icontains=query)
+                    | Q(name__unaccent__icontains=query)
+                    | Q(club__name__unaccent__icontains=query)
+                ).values_list('id', flat=True)[:50])
+
+            def fulltext(query):
+                list(search_projects(query).order_by('-rank').values_list('id', flat=True)[:50])
+
+            def fuzzy(query):
+                with similarity_threshold(options['threshold']):
+                    list(fuzzy_search_projects(query).order_by('-rank').values_list('id', flat=True)[:50])
+
+            self.stdout.write("{} projects, {} queries, first page of 50".format(Project.objects.count(), len(queries)))
+            self.stdout.write("{:<28} {:>12} {:>12}".format("search", "median ms", "p95 ms"))
+            for label, run, inputs in [
+                ("unaccent__icontains", icontains, queries),
+                ("full text", fulltext, queries),
+                ("fuzzy", fuzzy, queries),
+                ("unaccent__icontains, typo", icontains, typos),
+                ("fuzzy, typo", fuzzy, typos),
+            ]:
+                self.stdout.write("{:<28} {:>12.2f} {:>12.2f}".format(label, *self.timed(run, inputs)))
+
+            transaction.set_rollback(True)
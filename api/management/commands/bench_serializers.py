@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.forms.models import model_to_dict
+
+from api.controllers.serializers import project_serializer
+from api.models import Club, Project, User
+
+
+def legacy_serialize(projects):
+    '''
+    The list_to_dict path the project views used before the compiled serializer
+    '''
+    converted = []
+    for item in projects:
+        new_item = model_to_dict(item)
+        if hasattr(item, 'image'):
+            new_item["image"] = item.image.url if item.image else None
+        else:
+            new_item["image"] = None
+        if hasattr(item, 'club'):
+            new_item["club_name"] = item.club.name if item.club else None
+        new_item["techstack"] = item.techstack
+        converted.append(new_item)
+    return converted
+
+
+def compiled_serialize(projects):
+    return project_serializer.serialize(projects)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the per-row cost of serializing projects with model_to_dict "
+        "against the compiled values_list serializer. Seeds projects inside a "
+        "transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per size, the best one is reported")
+
+    def seed(self, club, head, start, count):
+        Project.objects.bulk_create([
+            Project(
+                name="Benchmark project {}".format(i),
+                abstract="Lorem ipsum dolor sit amet " * 40,
+                link="https://example.com/{}".format(i),
+                image="media/benchmark_{}.png".format(i),
+                club=club,
+                head=head,
+                techstack=["/media/react.png", "/media/django.png"],
+            )
+            for i in range(start, start + count)
+        ], batch_size=5000)
+
+    def best_time(self, serialize, repeat):
+        best = None
+        for _ in range(repeat):
+            queryset = Project.objects.select_related('club', 'head')
+            started = time.perf_counter()
+            serialize(queryset)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            head = User.objects.create_user(email="benchmark@nitt.edu", name="Benchmark", password=None)
+            club = Club.objects.create(name="Benchmark club", abstract="", link="", head=head)
+
+            self.stdout.write("{:>8} {:>16} {:>16} {:>8}".format("rows", "legacy us/row", "compiled us/row", "speedup"))
+            seeded = Project.objects.count()
+            for size in sorted(options['sizes']):
+                self.seed(club, head, seeded, size - Project.objects.count())
+                seeded = Project.objects.count()
+
+                legacy = self.best_time(legacy_serialize, options['repeat'])
+                compiled = self.best_time(compiled_serialize, options['repeat'])
+                self.stdout.write("{:>8} {:>16.2f} {:>16.2f} {:>7.1f}x".format(
+                    seeded, legacy / seeded * 1e6, compiled / seeded * 1e6, legacy / compiled
+                ))
+
+            transaction.set_rollback(True)
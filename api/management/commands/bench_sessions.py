@@ -0,0 +1,88 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import User, UserSession
+from api.sessions import SessionStore
+
+
+def legacy_remove_sessions(user_id):
+    '''
+    What remove_existing_sessions did before sessions carried their user:
+    decode every session to find those of the user
+    '''
+    for session in UserSession.objects.all():
+        if session.get_decoded().get('user_id', -1) == user_id:
+            session.delete()
+
+
+def indexed_remove_sessions(user_id):
+    UserSession.objects.filter(user_id=user_id).delete()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the cost of removing a user's sessions on login by decoding "
+        "every session against the indexed delete on UserSession.user. Seeds "
+        "users and sessions inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--logins', type=int, default=20, help="Users logging in, timed for each method")
+
+    def seed(self, users, sessions):
+        password = make_password(None)
+        User.objects.bulk_create([
+            User(email="bench{}@nitt.edu".format(i), name="Benchmark", password=password)
+            for i in range(users)
+        ], batch_size=5000)
+        user_ids = list(User.objects.filter(email__startswith="bench").values_list('id', flat=True))
+
+        store = SessionStore()
+        expire_date = timezone.now() + timedelta(days=14)
+        batch = []
+        for i in range(sessions):
+            user_id = user_ids[i % len(user_ids)]
+            batch.append(UserSession(
+                session_key="bench{:035d}".format(i),
+                session_data=store.encode({'user_id': user_id}),
+                expire_date=expire_date,
+                user_id=user_id,
+            ))
+            if len(batch) == 5000:
+                UserSession.objects.bulk_create(batch)
+                batch = []
+        UserSession.objects.bulk_create(batch)
+        return user_ids
+
+    def time_logins(self, remove, user_ids):
+        started = time.perf_counter()
+        for user_id in user_ids:
+            remove(user_id)
+        return (time.perf_counter() - started) / len(user_ids)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user_ids = self.seed(options['users'], options['sessions'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE {}'.format(UserSession._meta.db_table))
+
+            logins = options['logins']
+            # Each method removes the sessions of different users, so both
+            # find the same number of sessions to delete
+            legacy = self.time_logins(legacy_remove_sessions, user_ids[:logins])
+            indexed = self.time_logins(indexed_remove_sessions, user_ids[logins:2 * logins])
+
+            self.stdout.write("{} sessions of {} users".format(UserSession.objects.count(), len(user_ids)))
+            self.stdout.write("{:>10} {:>14.3f} ms/login".format("legacy", legacy * 1e3))
+            self.stdout.write("{:>10} {:>14.3f} ms/login {:>8.0f}x".format("indexed", indexed * 1e3, legacy / indexed))
+
+            self.stdout.write(UserSession.objects.filter(user_id=user_ids[-1]).explain())
+
+            transaction.set_rollback(True)
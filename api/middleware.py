@@ -0,0 +1,47 @@
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from api.controllers.compression import MIN_COMPRESS_LENGTH, compress, compress_stream, negotiate
+
+
+def weaken_etag(response):
+    # The compressed body is a different representation than the one the
+    # strong ETag was computed for
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = 'W/' + etag
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    '''
+    Compresses responses with brotli or gzip, whichever the client accepts
+    (brotli only when the brotli package is installed). Responses that are
+    already encoded, such as pre-compressed cached bodies, are left as is.
+    '''
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            weaken_etag(response)
+            return response
+
+        if not response.streaming and len(response.content) < MIN_COMPRESS_LENGTH:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(response.content))
+
+        weaken_etag(response)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,56 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:16
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Func, OuterRef, Subquery, TextField
+
+
+def weighted(field, weight):
+    unaccented = Func(field, function='unaccent', output_field=TextField())
+    return SearchVector(unaccented, weight=weight, config=settings.SEARCH_CONFIG)
+
+
+def fill_search_vectors(apps, schema_editor):
+    # Mirrors project_vector() and club_vector() in api/controllers/search_utilities.py
+    Club = apps.get_model('api', 'Club')
+    Project = apps.get_model('api', 'Project')
+
+    vectors = [
+        (Project, weighted('name', 'A') + weighted('club__name', 'B') + weighted('head__name', 'B') + weighted('abstract', 'C')),
+        (Club, weighted('name', 'A') + weighted('head__name', 'B') + weighted('abstract', 'C')),
+    ]
+    for model, vector in vectors:
+        document = model.objects.filter(pk=OuterRef('pk')).order_by().annotate(document=vector).values('document')
+        model.objects.update(search_vector=Subquery(document[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='club',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='club_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_vector_idx'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
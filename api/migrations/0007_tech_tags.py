@@ -0,0 +1,71 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:23
+
+import os
+import re
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+# Tags of the existing projects, which only have the stored logo paths.
+# Later uploads are tagged by their upload names instead, see
+# api.controllers.tech_utilities.save_techstack.
+
+# Random suffix FileSystemStorage appends when a file name is taken. Only
+# stripped when it has a capital or a digit, unlike a word such as the
+# "express" of node_express.
+STORAGE_SUFFIX_RE = re.compile(r'_(?=[a-z]*[A-Z0-9])[a-zA-Z0-9]{7}$')
+
+IMAGE_WORDS = {'logo', 'icon', 'img', 'image'}
+
+
+def fold(text):
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def normalize_tech(name):
+    words = [word for word in re.findall(r'[^\W_]+', fold(name)) if word not in IMAGE_WORDS]
+    return '-'.join(words)
+
+
+def tech_tag(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return normalize_tech(STORAGE_SUFFIX_RE.sub('', name))
+
+
+def tech_tags(techstack):
+    tags = []
+    for path in techstack or []:
+        tag = tech_tag(path) if isinstance(path, str) else ''
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def fill_tech_tags(apps, schema_editor):
+    Project = apps.get_model('api', 'Project')
+    for project in Project.objects.only('id', 'techstack').iterator():
+        project.tech_tags = tech_tags(project.techstack)
+        project.save(update_fields=['tech_tags'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='tech_tags',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tech_tags'], name='project_tech_tags_idx', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.RunPython(fill_tech_tags, migrations.RunPython.noop),
+    ]
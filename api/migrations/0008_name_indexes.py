@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_tech_tags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='club',
+            name='name',
+            field=models.CharField(db_index=True, default=None, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['club', '-created_at', '-id'], name='project_club_created_idx'),
+        ),
+    ]
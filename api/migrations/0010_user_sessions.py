@@ -0,0 +1,68 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:29
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+# Same as api.sessions.session_user_id() when this migration was written.
+# Kept here so the migration does not depend on the app code.
+def session_user_id(data):
+    user_id = data.get('user_id', data.get(SESSION_KEY))
+    try:
+        return int(user_id) if user_id is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def copy_sessions(apps, schema_editor):
+    # Decodes every existing session once, so that logged in users stay
+    # logged in after the switch to the api.sessions engine
+    Session = apps.get_model('sessions', 'Session')
+    UserSession = apps.get_model('api', 'UserSession')
+    User = apps.get_model('api', 'User')
+
+    user_ids = set(User.objects.values_list('id', flat=True))
+    store = SessionStore()
+    batch = []
+    for session in Session.objects.filter(expire_date__gt=django.utils.timezone.now()).iterator():
+        user_id = session_user_id(store.decode(session.session_data))
+        batch.append(UserSession(
+            session_key=session.session_key,
+            session_data=session.session_data,
+            expire_date=session.expire_date,
+            user_id=user_id if user_id in user_ids else None,
+        ))
+        if len(batch) == 5000:
+            UserSession.objects.bulk_create(batch)
+            batch = []
+    UserSession.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_club_recent_index'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSession',
+            fields=[
+                ('session_key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='session key')),
+                ('session_data', models.TextField(verbose_name='session data')),
+                ('expire_date', models.DateTimeField(db_index=True, verbose_name='expire date')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'session',
+                'verbose_name_plural': 'sessions',
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(copy_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:37
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicates(model, field):
+    # Keeps one membership per (club/project, user) pair, the one with the
+    # highest privilege so that nobody loses access, else the oldest
+    duplicated = model.objects.values(field, 'user').annotate(count=Count('id')).filter(count__gt=1)
+    for pair in duplicated.iterator():
+        memberships = model.objects.filter(**{field: pair[field], 'user': pair['user']})
+        keep = memberships.order_by('-privilege__code', 'id').values_list('id', flat=True)[0]
+        memberships.exclude(id=keep).delete()
+
+
+def remove_duplicate_memberships(apps, schema_editor):
+    remove_duplicates(apps.get_model('api', 'ClubMemberRelationship'), 'club')
+    remove_duplicates(apps.get_model('api', 'ProjectMemberRelationship'), 'project')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_user_sessions'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_memberships, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='clubmemberrelationship',
+            index=models.Index(fields=['user', 'privilege'], name='club_member_user_priv_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clubmemberrelationship',
+            index=models.Index(fields=['club', 'privilege'], name='club_member_club_priv_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectmemberrelationship',
+            index=models.Index(fields=['user', 'privilege'], name='project_member_user_priv_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='clubmemberrelationship',
+            constraint=models.UniqueConstraint(fields=('club', 'user'), name='club_member_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectmemberrelationship',
+            constraint=models.UniqueConstraint(fields=('project', 'user'), name='project_member_unique'),
+        ),
+    ]
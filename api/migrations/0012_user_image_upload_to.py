@@ -0,0 +1,22 @@
+# Generated by Django 4.1.7 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Catches the migrations up with User.image, whose upload_to was changed
+    # in the model without a migration. Only the model state changes, the
+    # column stays the same on Postgres, so databases on which 0004 already
+    # applied this operation are unaffected.
+
+    dependencies = [
+        ('api', '0011_membership_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='image',
+            field=models.FileField(blank=True, null=True, upload_to='documents/'),
+        ),
+    ]
@@ -2,6 +2,9 @@ from django.db import models
 from django.db.models.enums import IntegerChoices
 from django.utils.translation import gettext_lazy as _
 from django.db.models import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.sessions.base_session import AbstractBaseSession
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -27,7 +30,8 @@ class TimestampedModel(models.Model):
         ordering = ["-created_at", "-updated_at"]
 
 class Club(TimestampedModel):
-    name = models.CharField(max_length=255, default=None, unique=False)
+    # Indexed, clubs are looked up by name
+    name = models.CharField(max_length=255, default=None, unique=False, db_index=True)
     
     abstract = models.TextField(max_length=1e4)
     link = models.CharField(max_length=100)
@@ -36,6 +40,18 @@ class Club(TimestampedModel):
 
     head = models.ForeignKey("User", on_delete=models.CASCADE)
 
+    # Full text search document, kept up to date by api/signals.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # Supports keyset pagination over (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="club_created_id_idx"),
+            GinIndex(fields=["search_vector"], name="club_search_vector_idx"),
+            # Fuzzy (trigram) name search
+            GinIndex(fields=["name"], name="club_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
+
     def __str__(self):
         """Returns name of club"""
         # TODO
@@ -47,6 +63,19 @@ class ClubMemberRelationship(models.Model):
     
 	privilege = models.ForeignKey("ClubMemberPrivilege", on_delete=models.PROTECT)
 
+	class Meta:
+		constraints = [
+			# A user is a member of a club once. Also serves the access
+			# checks, which look up the membership of a user in a club.
+			models.UniqueConstraint(fields=["club", "user"], name="club_member_unique"),
+		]
+		indexes = [
+			# Clubs a user is an admin of, for the dashboards
+			models.Index(fields=["user", "privilege"], name="club_member_user_priv_idx"),
+			# Admins of a club, for the dashboards and admin panel
+			models.Index(fields=["club", "privilege"], name="club_member_club_priv_idx"),
+		]
+
 class ClubMemberPrivilege(models.Model):
     """Different permission levels for the members
     of a project.
@@ -69,7 +98,8 @@ class ClubMemberPrivilege(models.Model):
 class Project(TimestampedModel):
     """Project Model"""
 
-    name = models.CharField(max_length=255)
+    # Indexed, projects are looked up by name
+    name = models.CharField(max_length=255, db_index=True)
     abstract = models.TextField(max_length=1e4)
     image = models.FileField(null=True,blank=True,upload_to='media/')
     link = models.CharField(max_length=100)
@@ -77,6 +107,26 @@ class Project(TimestampedModel):
     head = models.ForeignKey("User", on_delete=models.CASCADE)
     techstack = models.JSONField(null=True, blank=True, default=list, help_text="List of tech stack image URLs/paths")
 
+    # Technology names of the techstack logos, taken from the names they were
+    # uploaded with, see save_techstack in api/controllers/tech_utilities.py
+    tech_tags = models.JSONField(default=list, blank=True, editable=False)
+
+    # Full text search document, kept up to date by api/signals.py
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta(TimestampedModel.Meta):
+        indexes = [
+            # Supports keyset pagination over (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="project_created_id_idx"),
+            # Most recent projects of a club, for the homepage
+            models.Index(fields=["club", "-created_at", "-id"], name="project_club_created_idx"),
+            GinIndex(fields=["search_vector"], name="project_search_vector_idx"),
+            # Fuzzy (trigram) name search
+            GinIndex(fields=["name"], name="project_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+            # Containment (@>) queries of the ?tech= filter
+            GinIndex(fields=["tech_tags"], name="project_tech_tags_idx", opclasses=["jsonb_path_ops"]),
+        ]
+
     def __str__(self):
         """Returns name of project"""
         return self.name
@@ -92,6 +142,17 @@ class ProjectMemberRelationship(models.Model):
     # One cannot delete a Privilege after it has been created
     privilege = models.ForeignKey("ProjectMemberPrivilege", on_delete=models.PROTECT)
 
+    class Meta:
+        constraints = [
+            # A user is a member of a project once. Also serves the access
+            # checks, which look up the membership of a user in a project.
+            models.UniqueConstraint(fields=["project", "user"], name="project_member_unique"),
+        ]
+        indexes = [
+            # Projects of a user with a given privilege
+            models.Index(fields=["user", "privilege"], name="project_member_user_priv_idx"),
+        ]
+
 class ProjectMemberPrivilege(models.Model):
     """Different permission levels for the members
     of a project.
@@ -185,4 +246,24 @@ class User(AbstractBaseUser, PermissionsMixin, TimestampedModel):
     EMAIL_FIELD = 'email'
     REQUIRED_FIELDS = ['name']
 
-    objects = UserManager()
\ No newline at end of file
+    objects = UserManager()
+
+    class Meta:
+        indexes = [
+            # Fuzzy (trigram) search on the names of heads
+            GinIndex(fields=["name"], name="user_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
+
+
+class UserSession(AbstractBaseSession):
+    """Session stored along with the user it belongs to (see api/sessions.py),
+    so that the sessions of a user can be found through an index instead of
+    decoding every session.
+    """
+
+    user = models.ForeignKey("User", null=True, blank=True, on_delete=models.CASCADE, related_name="sessions")
+
+    @classmethod
+    def get_session_store_class(cls):
+        from api.sessions import SessionStore
+        return SessionStore
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.cache import caches
+
+
+def session_user_id(data):
+    '''
+    Id of the user logged in with the session data, or None. The app sets
+    'user_id' itself, django.contrib.auth sets SESSION_KEY.
+    '''
+    user_id = data.get('user_id', data.get(SESSION_KEY))
+    try:
+        return int(user_id) if user_id is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SessionStore(CachedDBStore):
+    '''
+    Cached database session engine (SESSION_ENGINE = 'api.sessions').
+    Sessions are read from the cache, falling back to the database, and
+    stored in UserSession with the id of their user in its own column.
+    '''
+
+    @classmethod
+    def get_model_class(cls):
+        # Imported here, the session engine is loaded before the apps are ready
+        from api.models import UserSession
+        return UserSession
+
+    def create_model_instance(self, data):
+        session = super().create_model_instance(data)
+        session.user_id = session_user_id(data)
+        return session
+
+    @classmethod
+    def delete_user_sessions(cls, user_id):
+        '''
+        Deletes every session of the user, from the database and the cache
+        '''
+        model = cls.get_model_class()
+        keys = list(model.objects.filter(user_id=user_id).values_list('session_key', flat=True))
+        if keys:
+            model.objects.filter(session_key__in=keys).delete()
+            caches[settings.SESSION_CACHE_ALIAS].delete_many([cls.cache_key_prefix + key for key in keys])
+
+
+def session_user(request):
+    '''
+    The user of the request if its session is logged in as that user, else
+    None. Relies on the session and user already loaded by the session and
+    authentication middlewares, without querying the session again.
+    '''
+    user_id = request.session.get('user_id')
+    user = request.user
+    if user_id is None or not user.is_authenticated or user.id != user_id:
+        return None
+    return user
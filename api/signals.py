@@ -0,0 +1,246 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.controllers.cache_utilities import bump_versions
+from api.controllers.autocomplete import name_index
+from api.controllers.privileges import ADMIN, club_privileges, project_privileges
+from api.controllers.search_index import memory_search_enabled, search_index
+from api.controllers.search_utilities import refresh_clubs, refresh_projects
+from api.models import (
+    Club, ClubMemberPrivilege, ClubMemberRelationship, Project, ProjectMember, ProjectMemberPrivilege, User
+)
+
+# Receivers run in the order they are connected. Search vectors and the
+# in-process indexes are refreshed before cached responses are invalidated,
+# so that a response rebuilt right after the invalidation already sees the
+# new search data.
+
+
+def previous_values(sender, instance, fields):
+    '''
+    Values of the fields as currently stored, empty for new instances
+    '''
+    if instance.pk is None:
+        return {}
+    return sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Club)
+def remember_name(sender, instance, **kwargs):
+    # Entries cached under the old name (or for the old club of a project)
+    # must go as well on a rename or a move
+    fields = ['name', 'club'] if sender is Project else ['name']
+    previous = previous_values(sender, instance, fields)
+    instance._previous_name = previous.get('name')
+    instance._previous_club_id = previous.get('club')
+
+
+# ------------------------------
+# Search vectors
+# ------------------------------
+
+@receiver(post_save, sender=Project)
+def project_saved_search(sender, instance, **kwargs):
+    refresh_projects(Project.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Club)
+def club_saved_search(sender, instance, **kwargs):
+    refresh_clubs(Club.objects.filter(pk=instance.pk))
+    # Project documents include the club name
+    if getattr(instance, '_previous_name', None) not in (None, instance.name):
+        refresh_projects(Project.objects.filter(club=instance))
+
+
+@receiver(post_save, sender=User)
+def user_saved_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    # Documents include the name of the head
+    refresh_projects(Project.objects.filter(head=instance))
+    refresh_clubs(Club.objects.filter(head=instance))
+
+
+# ------------------------------
+# In-process search index
+# ------------------------------
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed_index(sender, instance, **kwargs):
+    if memory_search_enabled():
+        search_index.update(project_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def club_changed_index(sender, instance, **kwargs):
+    if not memory_search_enabled():
+        return
+    project_ids = []
+    if getattr(instance, '_previous_name', None) not in (None, instance.name):
+        project_ids = list(Project.objects.filter(club=instance).values_list('id', flat=True))
+    search_index.update(project_ids=project_ids, club_ids=[instance.pk])
+
+
+@receiver(post_save, sender=User)
+def user_changed_index(sender, instance, update_fields=None, **kwargs):
+    if not memory_search_enabled():
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    project_ids = list(Project.objects.filter(head=instance).values_list('id', flat=True))
+    club_ids = list(Club.objects.filter(head=instance).values_list('id', flat=True))
+    if project_ids or club_ids:
+        search_index.update(project_ids=project_ids, club_ids=club_ids)
+
+
+# ------------------------------
+# Autocomplete names
+# ------------------------------
+
+def name_changed(instance, created):
+    return created or getattr(instance, '_previous_name', None) != instance.name
+
+
+@receiver(post_save, sender=Project)
+def project_saved_name(sender, instance, created, **kwargs):
+    if name_changed(instance, created):
+        name_index.update(project_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Club)
+def club_saved_name(sender, instance, created, **kwargs):
+    if name_changed(instance, created):
+        name_index.update(club_ids=[instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted_name(sender, instance, **kwargs):
+    name_index.update(project_ids=[instance.pk])
+
+
+@receiver(post_delete, sender=Club)
+def club_deleted_name(sender, instance, **kwargs):
+    name_index.update(club_ids=[instance.pk])
+
+
+# ------------------------------
+# Cache invalidation
+# See api/controllers/cache_utilities.py for the entity names.
+# ------------------------------
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    names = {instance.name, getattr(instance, '_previous_name', None)} - {None}
+    bump_versions('projects', *['project:' + name for name in names])
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def club_changed(sender, instance, **kwargs):
+    names = {instance.name, getattr(instance, '_previous_name', None)} - {None}
+    # Project listings and search include the club name
+    bump_versions('clubs', 'projects', *['club:' + name for name in names])
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def project_member_changed(sender, instance, **kwargs):
+    name = Project.objects.filter(pk=instance.project_id).values_list('name', flat=True).first()
+    if name is not None:
+        bump_versions('project:' + name)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Logging in only updates last_login, which nothing cached shows
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+
+    # Heads are shown on details and matched by search
+    projects = list(Project.objects.filter(head=instance).values_list('name', flat=True))
+    clubs = list(Club.objects.filter(head=instance).values_list('name', flat=True))
+    if projects or clubs:
+        bump_versions(
+            'projects', 'clubs',
+            *['project:' + name for name in projects],
+            *['club:' + name for name in clubs]
+        )
+
+
+# ------------------------------
+# Dashboards
+# A club head dashboard shows the clubs its user is an admin of, with their
+# admins and projects. Changes to a club therefore invalidate the
+# dashboards of all its admins, along with its admin panel details.
+# ------------------------------
+
+def club_dashboards_changed(club_ids, club_names=(), user_ids=()):
+    '''
+    Invalidates the dashboards of the admins of the given clubs and of the
+    given users, and the admin details of the given clubs
+    '''
+    club_ids = set(club_ids) - {None}
+    user_ids = set(user_ids)
+    club_names = set(club_names)
+    if club_ids:
+        user_ids.update(ClubMemberRelationship.objects.filter(
+            club__in=club_ids, privilege_id=club_privileges.id(ADMIN)
+        ).values_list('user_id', flat=True))
+        club_names.update(Club.objects.filter(id__in=club_ids).values_list('name', flat=True))
+    names = ['dashboard:{}'.format(user_id) for user_id in user_ids]
+    names += ['admin_club:' + name for name in club_names - {None}]
+    if names:
+        bump_versions(*names)
+
+
+@receiver(post_save, sender=ClubMemberRelationship)
+@receiver(post_delete, sender=ClubMemberRelationship)
+def club_member_changed(sender, instance, **kwargs):
+    # The user may have just stopped being an admin, so is not found above
+    club_dashboards_changed([instance.club_id], user_ids=[instance.user_id])
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+def club_changed_dashboards(sender, instance, **kwargs):
+    club_dashboards_changed([instance.pk], club_names=[instance.name, getattr(instance, '_previous_name', None)])
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed_dashboards(sender, instance, **kwargs):
+    club_dashboards_changed([instance.club_id, getattr(instance, '_previous_club_id', None)])
+
+
+@receiver(post_save, sender=User)
+def user_changed_dashboards(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    # Dashboards show the names and emails of club admins, club heads and
+    # project heads
+    club_ids = set(ClubMemberRelationship.objects.filter(user=instance).values_list('club_id', flat=True))
+    club_ids.update(Club.objects.filter(head=instance).values_list('id', flat=True))
+    club_ids.update(Project.objects.filter(head=instance).values_list('club_id', flat=True))
+    club_dashboards_changed(club_ids)
+
+
+# ------------------------------
+# Privilege registry
+# The privilege rows are seeded once, this only keeps the registry of the
+# process making a change (e.g. a test or a shell) in line with the table.
+# ------------------------------
+
+@receiver(post_save, sender=ClubMemberPrivilege)
+@receiver(post_delete, sender=ClubMemberPrivilege)
+def club_privileges_changed(sender, instance, **kwargs):
+    club_privileges.clear()
+
+
+@receiver(post_save, sender=ProjectMemberPrivilege)
+@receiver(post_delete, sender=ProjectMemberPrivilege)
+def project_privileges_changed(sender, instance, **kwargs):
+    project_privileges.clear()
@@ -1,3 +1,1158 @@
-from django.test import TestCase
+import base64
+import gzip
+import json
+import tempfile
+import time
 
-# Create your tests here.
+import brotli
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.http import HttpResponse, QueryDict, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from api.controllers.autocomplete import NameIndex, name_index
+from api.controllers.search_index import InvertedIndex, tokenize
+from api.controllers.search_utilities import search_clubs, search_projects, to_search_query
+from api.controllers.serializers import PROJECT_FIELDS, Serializer, parse_fields
+from api.controllers.tech_utilities import parse_tech, tech_tags
+from api.controllers.admin_utilities import admin_club_detail, admin_club_serializer, admin_clubs
+from api.controllers.club_utilities import club_detail
+from api.controllers.dashboard_utilities import cached_club_head_dashboard, club_head_dashboard
+from api.controllers.home_utilities import homepage
+from api.controllers.pagination import encode_cursor
+from api.controllers.privilege_utilities import resolve_club
+from api.controllers.response_format import unauthorized_response
+from api.controllers.privileges import ADMIN, VIEW, club_privileges, project_privileges
+from api.controllers.project_utilities import project_detail, project_details
+from api.controllers.user_utilities import remove_existing_sessions
+from api.middleware import CompressionMiddleware
+from api.models import (
+    Club, ClubMemberPrivilege, ClubMemberRelationship, Project, ProjectMember, ProjectMemberRelationship, User, UserSession
+)
+from api.sessions import SessionStore
+
+
+def create_projects(club, head, count, start=0):
+    """Bulk creates `count` projects under the given club"""
+    Project.objects.bulk_create([
+        Project(
+            name="Project {}".format(i),
+            abstract="Abstract {}".format(i),
+            link="https://example.com/{}".format(i),
+            club=club,
+            head=head,
+        )
+        for i in range(start, start + count)
+    ])
+
+
+# Tests read and clear a cache of their own, not the file cache of a server
+# running on the same host
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class Fixtures:
+    """
+    Users, clubs and logins shared by the test cases. The privilege rows
+    themselves are seeded by migration 0003.
+    """
+
+    password = "password123"
+
+    def create_user(self, email="head@nitt.edu", name="Head", **fields):
+        return User.objects.create_user(email=email, name=name, password=self.password, **fields)
+
+    def create_club(self, name, head, **fields):
+        fields.setdefault('abstract', "Abstract")
+        fields.setdefault('link', "https://example.com")
+        return Club.objects.create(name=name, head=head, **fields)
+
+    def add_admin(self, club, user):
+        return ClubMemberRelationship.objects.create(club=club, user=user, privilege=club_privileges.get(ADMIN))
+
+    def login(self, user):
+        response = self.client.post(reverse('api:user-login'), {'email': user.email, 'password': self.password})
+        self.assertEqual(response.json()['status_code'], 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AllProjectsQueryCountTest(Fixtures, TestCase):
+    """
+    The project listing must not issue a query per project.
+    """
+
+    def setUp(self):
+        self.head = self.create_user()
+        self.club = self.create_club("Club", self.head)
+
+    def count_listing_queries(self):
+        # bulk_create sends no signals, so cached listings would not be invalidated
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('api:projects-all'))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_is_flat(self):
+        create_projects(self.club, self.head, 10)
+        small = self.count_listing_queries()
+
+        create_projects(self.club, self.head, 10000 - 10, start=10)
+        large = self.count_listing_queries()
+
+        self.assertEqual(small, large)
+        # ETag aggregates over projects and clubs, then the page itself
+        self.assertEqual(large, 3)
+
+
+class RoutingTest(SimpleTestCase):
+    """
+    Fixed routes do not capture project or club names that start with them.
+    """
+
+    def assertRoute(self, path, name):
+        self.assertEqual(resolve(path).view_name, 'api:' + name)
+
+    def test_edit(self):
+        self.assertRoute('/api/project/edit', 'project-edit')
+        self.assertRoute('/api/project/edit-distance', 'project-detail')
+        self.assertRoute('/api/club/edit', 'club-edit')
+        self.assertRoute('/api/club/editorial', 'club-detail')
+
+    def test_batch(self):
+        self.assertRoute('/api/project/batch', 'project-batch')
+        self.assertRoute('/api/project/batchnorm-accelerator', 'project-detail')
+        self.assertRoute('/api/club/batch', 'club-batch')
+        self.assertRoute('/api/club/batch-processing', 'club-detail')
+
+    def test_tags(self):
+        self.assertRoute('/api/project/tags', 'project-tags')
+        self.assertRoute('/api/project/tagsense', 'project-detail')
+
+    def test_facets(self):
+        self.assertRoute('/api/project/facets', 'project-facets')
+        self.assertRoute('/api/project/facets-explorer', 'project-detail')
+
+
+class SerializerTest(SimpleTestCase):
+    """
+    Requested fields are read once each, and any order of them shares one
+    plan.
+    """
+
+    def test_parse_fields(self):
+        self.assertIsNone(parse_fields(QueryDict(), PROJECT_FIELDS))
+        self.assertEqual(parse_fields(QueryDict("fields=name,id,name,,name"), PROJECT_FIELDS), ["id", "name"])
+        for fields in ("", ",", "name,password"):
+            with self.assertRaises(ValueError):
+                parse_fields(QueryDict("fields=" + fields), PROJECT_FIELDS)
+
+    def test_plans(self):
+        serializer = Serializer(PROJECT_FIELDS)
+        plan = serializer.plan(["name", "id"])
+        self.assertIs(serializer.plan(["id", "name", "name"]), plan)
+        self.assertEqual(len(serializer.plans), 1)
+        # The columns selected: the keyset, then the fields
+        self.assertEqual(plan[0], ['created_at', 'id', 'name'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class KeysetPaginationTest(Fixtures, TestCase):
+    """
+    Following the next cursors of the listings and searches returns every
+    row once, also when rows share their first key.
+    """
+
+    def setUp(self):
+        cache.clear()
+        head = self.create_user()
+        club = self.create_club("Robotics Club", head)
+        for i in range(7):
+            Project.objects.create(
+                name="Rover {}".format(i), abstract="Robotics rover", link="https://example.com/{}".format(i),
+                club=club, head=head
+            )
+            self.create_club("Robotics {}".format(i), head)
+        # Rows created in the same instant, ordered by id alone
+        created_at = timezone.now()
+        Project.objects.update(created_at=created_at)
+        Club.objects.update(created_at=created_at)
+
+    def page(self, view, params):
+        response = self.client.get(reverse(view), {'fields': "id", **params}).json()
+        self.assertEqual(response['status_code'], 200, response)
+        return [row['id'] for row in response['data']], response['next']
+
+    def walk(self, view, **params):
+        ids, cursor = [], None
+        while True:
+            page, cursor = self.page(view, {'page_size': 2, **params, **({'cursor': cursor} if cursor else {})})
+            self.assertLessEqual(len(page), 2)
+            ids += page
+            if cursor is None:
+                return ids
+
+    def test_listings(self):
+        for view, model in [('api:projects-all', Project), ('api:club-all', Club)]:
+            self.assertEqual(self.walk(view), list(model.objects.order_by('-id').values_list('id', flat=True)), view)
+
+    def test_memory_search(self):
+        with self.settings(SEARCH_BACKEND='memory'):
+            self.assertEqual(
+                self.walk('api:project-search', query="rover"),
+                list(Project.objects.order_by('-id').values_list('id', flat=True))
+            )
+            self.assertEqual(
+                self.walk('api:club-search', query="robotics"),
+                list(Club.objects.order_by('-id').values_list('id', flat=True))
+            )
+
+    def test_rank_keyset(self):
+        # Every project ranks the same, so pages are told apart by their id
+        for view, model, query in [('api:project-search', Project, "rover"), ('api:club-search', Club, "robotics")]:
+            ids = self.walk(view, query=query)
+            self.assertEqual(sorted(ids), sorted(model.objects.values_list('id', flat=True)), view)
+            self.assertEqual(len(set(ids)), len(ids))
+
+        _, cursor = self.page('api:project-search', {'query': "rover", 'page_size': 2})
+        rank, last_id = json.loads(base64.urlsafe_b64decode(cursor))
+        self.assertIsInstance(rank, float)
+        self.assertIsInstance(last_id, int)
+
+    def test_invalid_cursor(self):
+        invalid = {'status_code': 400, 'data': "Invalid cursor or page size"}
+        cursors = [
+            "garbage", "%%%", encode_cursor([1, 2, 3]), encode_cursor(["not a date", 1]),
+            base64.urlsafe_b64encode(b"{not json").decode(),
+        ]
+        for view in ('api:projects-all', 'api:club-all'):
+            for cursor in cursors:
+                self.assertEqual(self.client.get(reverse(view), {'cursor': cursor}).json(), invalid, (view, cursor))
+            self.assertEqual(self.client.get(reverse(view), {'page_size': "ten"}).json(), invalid)
+        with self.settings(SEARCH_BACKEND='memory'):
+            for view in ('api:project-search', 'api:club-search'):
+                response = self.client.get(reverse(view), {'query': "robotics", 'cursor': "garbage"})
+                self.assertEqual(response.json(), invalid)
+
+    @override_settings(API_PAGE_SIZE=4, API_MAX_PAGE_SIZE=5)
+    def test_page_size(self):
+        for page_size, count in [(None, 4), (0, 1), (-3, 1), (2, 2), (1000, 5)]:
+            params = {'page_size': page_size} if page_size is not None else {}
+            ids, cursor = self.page('api:projects-all', params)
+            self.assertEqual(len(ids), count, page_size)
+            self.assertIsNotNone(cursor)
+
+
+class InvertedIndexTest(SimpleTestCase):
+    """
+    The in-process search index matches accent folded word prefixes and
+    stays consistent across updates.
+    """
+
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.add(1, tokenize("Café Robotics", "Line follower"))
+        self.index.add(2, tokenize("Robotics Club", "Drones"))
+        self.index.add(3, tokenize("Web Club", "React"))
+
+    def test_prefix_and_accents(self):
+        self.assertEqual(self.index.search("robo"), [1, 2])
+        self.assertEqual(self.index.search("CAFE rob"), [1])
+        self.assertEqual(self.index.search("club dro"), [2])
+        self.assertEqual(self.index.search("unknown"), [])
+
+    def test_update_and_remove(self):
+        self.index.add(2, tokenize("Aero Club"))
+        self.assertEqual(self.index.search("robotics"), [1])
+        self.assertEqual(self.index.search("aero"), [2])
+
+        self.index.remove(3)
+        self.assertEqual(self.index.search("club"), [2])
+        self.assertNotIn("react", self.index.tokens)
+
+    def test_shared_tokens(self):
+        # Documents refer to the same string for a token they share
+        first, second = [
+            token for doc_id in (2, 3) for token in self.index.documents[doc_id] if token == "club"
+        ]
+        self.assertIs(first, second)
+
+    def test_bulk(self):
+        index = InvertedIndex()
+        with index.bulk():
+            index.add(1, tokenize("Robotics Club"))
+            index.add(2, tokenize("Aero Club"))
+            index.add(2, tokenize("Aero Society"))
+        self.assertEqual(index.tokens, ["aero", "club", "robotics", "society"])
+        self.assertEqual(index.search("c"), [1])
+        self.assertEqual(index.search("aer soc"), [2])
+
+    def test_copy(self):
+        # Updates go to a copy, the index being searched stays as it is
+        copy = self.index.copy()
+        copy.add(2, tokenize("Aero Club"))
+        copy.remove(3)
+        self.assertEqual(copy.search("club"), [2])
+        self.assertEqual(self.index.search("club"), [2, 3])
+        self.assertEqual(self.index.search("robotics"), [1, 2])
+        self.assertIn("react", self.index.tokens)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FullTextSearchTest(Fixtures, TestCase):
+    """
+    Postgres full text search matches word prefixes regardless of accents,
+    ranks name matches first and follows renames of clubs and heads.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.head = self.create_user(name="Asha")
+        self.club = self.create_club("Robotics Club", self.head)
+        for name, abstract in [
+            ("Rover", "A six wheeled rover for rough terrain"),
+            ("Drone", "A quadcopter scouting ahead of the rover"),
+            ("Café Finder", "Finds coffee shops on campus"),
+        ]:
+            Project.objects.create(
+                name=name, abstract=abstract, link="https://example.com", club=self.club, head=self.head
+            )
+
+    def names(self, queryset):
+        return sorted(queryset.values_list('name', flat=True))
+
+    def test_query(self):
+        self.assertIsNone(to_search_query(" ,;- "))
+        self.assertEqual(self.names(search_projects(" ,;- ")), [])
+
+        # Every word is matched as a prefix
+        self.assertEqual(self.names(search_projects("rov")), ["Drone", "Rover"])
+        self.assertEqual(self.names(search_projects("rov terr")), ["Rover"])
+        self.assertEqual(self.names(search_projects("rov xyz")), [])
+
+        # Accents are ignored on both sides
+        self.assertEqual(self.names(search_projects("cafe")), ["Café Finder"])
+        self.assertEqual(self.names(search_projects("CAFÉ fin")), ["Café Finder"])
+
+        # Stop words match nothing by themselves and are left out otherwise
+        self.assertEqual(self.names(search_projects("the")), [])
+        self.assertEqual(self.names(search_projects("the rough")), ["Rover"])
+
+    def test_ranking(self):
+        # A match in the name ranks above one in the abstract
+        response = self.client.get(reverse('api:project-search'), {'query': "rover", 'fields': "name"})
+        self.assertEqual(response.json()['data'], [{'name': "Rover"}, {'name': "Drone"}])
+
+        response = self.client.get(reverse('api:project-search'), {'query': "the"})
+        self.assertEqual(response.json(), {'status_code': 200, 'data': [], 'next': None})
+
+    def test_rename(self):
+        self.assertEqual(self.names(search_projects("aerospace")), [])
+        self.club.name = "Aerospace Club"
+        self.club.save()
+        # Project documents hold the club name
+        self.assertEqual(self.names(search_projects("aerospace")), ["Café Finder", "Drone", "Rover"])
+        self.assertEqual(self.names(search_projects("robotics")), [])
+        self.assertEqual(self.names(search_clubs("aero")), ["Aerospace Club"])
+
+        self.head.name = "Meera"
+        self.head.save()
+        self.assertEqual(self.names(search_projects("meera")), ["Café Finder", "Drone", "Rover"])
+        self.assertEqual(self.names(search_clubs("meera")), ["Aerospace Club"])
+        self.assertEqual(self.names(search_projects("asha")), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FuzzySearchTest(Fixtures, TestCase):
+    """
+    ?mode=fuzzy matches names despite typos, above a similarity threshold
+    that can be set with ?threshold=.
+    """
+
+    def setUp(self):
+        cache.clear()
+        head = self.create_user(name="Asha")
+        club = self.create_club("Robotics Club", head)
+        for name in ("Rover", "Drone"):
+            Project.objects.create(name=name, abstract="Abstract", link="https://example.com", club=club, head=head)
+
+    def search(self, view, **params):
+        return self.client.get(reverse(view), {'fields': "name", **params}).json()
+
+    def test_typo(self):
+        self.assertEqual(self.search('api:project-search', query="rovr")['data'], [])
+        self.assertEqual(self.search('api:project-search', query="rovr", mode="fuzzy")['data'], [{'name': "Rover"}])
+        self.assertEqual(self.search('api:club-search', query="robtics", mode="fuzzy")['data'], [{'name': "Robotics Club"}])
+        # Projects are matched by their club name as well
+        self.assertEqual(
+            sorted(project['name'] for project in self.search('api:project-search', query="robtics", mode="fuzzy")['data']),
+            ["Drone", "Rover"]
+        )
+
+    def test_threshold(self):
+        self.assertEqual(self.search('api:project-search', query="rovr", mode="fuzzy", threshold=1)['data'], [])
+        self.assertEqual(
+            self.search('api:project-search', query="rovr", mode="fuzzy", threshold="0.5")['data'], [{'name': "Rover"}]
+        )
+
+    def test_invalid_threshold(self):
+        for view in ('api:project-search', 'api:club-search'):
+            for threshold in ("0", "-0.5", "1.5", "nan", "high"):
+                self.assertEqual(
+                    self.search(view, query="rovr", mode="fuzzy", threshold=threshold),
+                    {'status_code': 400, 'data': "Invalid threshold"}
+                )
+            self.assertEqual(
+                self.search(view, query="rovr", mode="soundex"), {'status_code': 400, 'data': "Invalid search mode"}
+            )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AutocompleteTest(Fixtures, TestCase):
+    """
+    Suggestions come from the in-process name index and follow renames.
+    """
+
+    def setUp(self):
+        cache.clear()
+        head = self.create_user()
+        self.club = self.create_club("Robotics Club", head)
+        Project.objects.create(
+            name="Rover", abstract="Abstract", link="https://example.com/rover", club=self.club, head=head
+        )
+
+    def suggest(self, query, **params):
+        response = self.client.get(reverse('api:autocomplete'), {'query': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_suggestions(self):
+        self.assertEqual(self.suggest("ro"), [
+            {'type': 'club', 'name': "Robotics Club"},
+            {'type': 'project', 'name': "Rover"},
+        ])
+        self.assertEqual(self.suggest("CLUB"), [{'type': 'club', 'name': "Robotics Club"}])
+        self.assertEqual(self.suggest("ro", type="project"), [{'type': 'project', 'name': "Rover"}])
+        self.assertEqual(self.suggest("ro", limit=1), [{'type': 'club', 'name': "Robotics Club"}])
+
+        # Once built, the index answers without querying the database
+        with self.assertNumQueries(0):
+            self.suggest("rov")
+
+    def test_rename(self):
+        self.suggest("ro")
+        self.club.name = "Aero Club"
+        self.club.save()
+        self.assertEqual(self.suggest("aer"), [{'type': 'club', 'name': "Aero Club"}])
+        self.assertEqual(self.suggest("rob"), [])
+
+    def test_rename_during_completion(self):
+        # The names a running completion reads are not changed under it
+        names = name_index.current()
+        self.club.name = "Aero Club"
+        self.club.save()
+        self.assertEqual(names.complete("ro", 10), [
+            {'type': 'club', 'name': "Robotics Club"},
+            {'type': 'project', 'name': "Rover"},
+        ])
+        self.assertEqual(name_index.complete("ro", 10), [{'type': 'project', 'name': "Rover"}])
+
+    def test_other_worker(self):
+        other = NameIndex()
+        other.current()
+        self.club.name = "Aero Club"
+        self.club.save()
+        # The other worker re-indexes the renamed club rather than rebuilding
+        with self.assertNumQueries(1):
+            self.assertEqual(other.complete("aer", 10), [{'type': 'club', 'name': "Aero Club"}])
+
+        cache.clear()
+        with self.assertNumQueries(2):
+            self.assertEqual(other.complete("aer", 10), [{'type': 'club', 'name': "Aero Club"}])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TechFilterTest(Fixtures, TestCase):
+    """
+    Tech tags are derived from the names the techstack logos were uploaded
+    with, filter projects and are counted by the facets.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.head = self.create_user()
+        self.club = self.create_club("Club", self.head)
+        for name, tags in [("One", ["react"]), ("Two", ["react", "django"]), ("Three", ["c++"]), ("Four", ["c"])]:
+            Project.objects.create(
+                name=name, abstract="Abstract", link="https://example.com/" + name,
+                club=self.club, head=self.head, techstack=["/media/{}.png".format(tag) for tag in tags], tech_tags=tags
+            )
+
+    def test_tags(self):
+        self.assertEqual(
+            tech_tags(["React_logo.png", "react.svg", "Node.js.png", "node_express.png", "C++.png", "C#.svg", "C.png"]),
+            ["react", "node-js", "node-express", "c++", "c#", "c"]
+        )
+        self.assertEqual(parse_tech(QueryDict("tech=C%2B%2B,c%23,React")), ["c#", "c++", "react"])
+
+    def test_upload_names(self):
+        project = Project.objects.get(name="One")
+        ProjectMemberRelationship.objects.create(project=project, user=self.head, privilege=project_privileges.get(ADMIN))
+        self.login(self.head)
+        logos = [SimpleUploadedFile(name, b"logo") for name in ("C++.png", "C#.png", "C.png", "C.png")]
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            response = self.client.post(reverse('api:project-edit'), {
+                'name': "One", 'link': "https://example.com/One", 'abstract': "Abstract", 'techstack': logos,
+            })
+        self.assertEqual(response.json()['status_code'], 200)
+        project.refresh_from_db()
+        # Stored as c.png, c_<random>.png and so on, which no longer tell
+        # the three apart
+        self.assertEqual(len(project.techstack), 4)
+        self.assertEqual(project.tech_tags, ["c++", "c#", "c"])
+
+    def test_filter(self):
+        response = self.client.get(reverse('api:projects-all'), {'tech': "React,Django", 'fields': "name"})
+        self.assertEqual(response.json()['data'], [{'name': "Two"}])
+
+        response = self.client.get(reverse('api:projects-all'), {'tech': "C++", 'fields': "name"})
+        self.assertEqual(response.json()['data'], [{'name': "Three"}])
+
+        response = self.client.get(reverse('api:project-tags'))
+        self.assertEqual(response.json()['data'], [
+            {'tech': "react", 'count': 2}, {'tech': "c", 'count': 1},
+            {'tech': "c++", 'count': 1}, {'tech': "django", 'count': 1},
+        ])
+
+    def test_facets(self):
+        response = self.client.get(reverse('api:project-facets'), {'tech': "django"})
+        self.assertEqual(response.json()['data'], {
+            'clubs': [{'club': self.club.id, 'club_name': "Club", 'count': 1}],
+            'tech': [{'tech': "django", 'count': 1}, {'tech': "react", 'count': 1}],
+        })
+
+    @override_settings(SEARCH_BACKEND='memory')
+    def test_memory_facets(self):
+        # The in-process index matches tech tags and prefixes, which the
+        # Postgres search does not, and the counts follow it
+        response = self.client.get(reverse('api:project-search'), {'query': "djan", 'fields': "name"})
+        self.assertEqual(response.json()['data'], [{'name': "Two"}])
+        response = self.client.get(reverse('api:project-facets'), {'query': "djan"})
+        self.assertEqual(response.json()['data'], {
+            'clubs': [{'club': self.club.id, 'club_name': "Club", 'count': 1}],
+            'tech': [{'tech': "django", 'count': 1}, {'tech': "react", 'count': 1}],
+        })
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DetailQueryCountTest(Fixtures, TestCase):
+    """
+    Details are read in a fixed number of queries, however many members
+    a project has.
+    """
+
+    def setUp(self):
+        head = self.create_user()
+        club = self.create_club("Club", head)
+        project = Project.objects.create(
+            name="Project", abstract="Abstract", link="https://example.com/project", club=club, head=head
+        )
+        ProjectMember.objects.bulk_create([
+            ProjectMember(project=project, name="Member {}".format(i)) for i in range(20)
+        ])
+
+    def test_project_detail(self):
+        with self.assertNumQueries(2):
+            project = project_detail("Project")
+        self.assertEqual(project["email"], "head@nitt.edu")
+        self.assertEqual(len(project["members"]), 20)
+
+    def test_club_detail(self):
+        with self.assertNumQueries(1):
+            club = club_detail("Club")
+        self.assertEqual(club["email"], "head@nitt.edu")
+
+    def test_missing(self):
+        self.assertIsNone(project_detail("Missing"))
+        self.assertIsNone(club_detail("Missing"))
+
+    def test_batch(self):
+        with self.assertNumQueries(2):
+            details = project_details("name", ["Project", "Missing"])
+        self.assertEqual(len(details["Project"]["members"]), 20)
+
+        response = self.client.get(reverse('api:project-batch'), {'name': ["Missing", "Project"]})
+        data = response.json()['data']
+        self.assertEqual(data[0], {'name': "Missing", 'error': "Project does not exist"})
+        self.assertEqual(data[1]['data']['name'], "Project")
+
+
+@override_settings(CACHES=LOCMEM_CACHES, HOMEPAGE_RECENT_PROJECTS=3)
+class HomepageTest(Fixtures, TestCase):
+    """
+    The homepage lists every club with its latest projects in two queries.
+    """
+
+    def test_homepage(self):
+        head = self.create_user()
+        clubs = [self.create_club(name, head) for name in ("Aero", "Robotics", "Web")]
+        create_projects(clubs[0], head, 5)
+        create_projects(clubs[1], head, 2, start=5)
+
+        with self.assertNumQueries(2):
+            data = homepage()
+
+        self.assertEqual([club['name'] for club in data], ["Aero", "Robotics", "Web"])
+        self.assertEqual([club['project_count'] for club in data], [5, 2, 0])
+        self.assertEqual([project['name'] for project in data[0]['projects']], ["Project 4", "Project 3", "Project 2"])
+        self.assertEqual(len(data[1]['projects']), 2)
+        self.assertEqual(data[2]['projects'], [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ClubHeadDashboardQueryCountTest(Fixtures, TestCase):
+    """
+    The club head dashboard must not issue queries per club, head or
+    project.
+    """
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.heads = 0
+
+    def create_headed_club(self, name, heads, projects):
+        club = self.create_club(name, self.user)
+        self.add_admin(club, self.user)
+        for _ in range(heads):
+            self.heads += 1
+            self.add_admin(club, self.create_user("head{}@nitt.edu".format(self.heads)))
+        create_projects(club, self.user, projects, start=self.heads * 100)
+
+    def test_query_count_is_constant(self):
+        self.create_headed_club("One", heads=1, projects=2)
+        with self.assertNumQueries(3):
+            dashboard = club_head_dashboard(self.user)
+        self.assertEqual(len(dashboard), 1)
+
+        self.create_headed_club("Two", heads=3, projects=5)
+        self.create_headed_club("Three", heads=2, projects=4)
+        with self.assertNumQueries(3):
+            dashboard = club_head_dashboard(self.user)
+
+        self.assertEqual(len(dashboard), 3)
+        heads = {club["club"]["name"]: len(club["club_heads"]) for club in dashboard}
+        self.assertEqual(heads, {"One": 2, "Two": 4, "Three": 3})
+        projects = {club["club"]["name"]: len(club["projects"]) for club in dashboard}
+        self.assertEqual(projects, {"One": 2, "Two": 5, "Three": 4})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AdminClubQueryCountTest(Fixtures, TestCase):
+    """
+    The admin club list and detail are read in a fixed number of queries,
+    with their counts annotated.
+    """
+
+    def setUp(self):
+        cache.clear()
+        for i in range(3):
+            head = self.create_user("head{}@nitt.edu".format(i))
+            club = self.create_club("Club {}".format(i), head)
+            self.add_admin(club, head)
+            create_projects(club, head, 3 + i, start=i * 10)
+
+    def test_list(self):
+        with self.assertNumQueries(1):
+            clubs, serialize = admin_club_serializer.rows(admin_clubs(), ["name", "head", "project_count", "admin_count"])
+            data = [serialize(club) for club in clubs.order_by("name")]
+        self.assertEqual(data[2], {"name": "Club 2", "head": "head2@nitt.edu", "project_count": 5, "admin_count": 1})
+
+    def test_detail(self):
+        with self.assertNumQueries(3):
+            data = admin_club_detail("Club 1", QueryDict("page_size=2"))
+        self.assertEqual(data["project_count"], 4)
+        self.assertEqual(data["admin_users"], [{"id": data["admin_users"][0]["id"], "email": "head1@nitt.edu", "name": "Head"}])
+        self.assertEqual(len(data["projects"]), 2)
+        self.assertIsNotNone(data["next"])
+        self.assertIsNone(admin_club_detail("Missing", QueryDict()))
+
+    def test_list_view(self):
+        self.login(self.create_user("admin@nitt.edu", "Admin", is_admin=True))
+        response = self.client.get(reverse('api:admin-clubs-list'), {'page_size': 2})
+        data = response.json()
+        self.assertEqual(data['status_code'], 200)
+        self.assertEqual(
+            [(club['name'], club['project_count'], club['admin_count']) for club in data['data']],
+            [("Club 2", 5, 1), ("Club 1", 4, 1)]
+        )
+        self.assertIsNotNone(data['next'])
+
+        data = self.client.get(reverse('api:admin-clubs-list'), {'page_size': 2, 'cursor': data['next']}).json()
+        self.assertEqual([club['name'] for club in data['data']], ["Club 0"])
+        self.assertIsNone(data['next'])
+
+        data = self.client.get(reverse('api:admin-clubs-list'), {'fields': 'name,project_count'}).json()
+        self.assertEqual(data['data'][0], {"name": "Club 2", "project_count": 5})
+
+    def test_list_view_requires_admin(self):
+        self.login(self.create_user("admin@nitt.edu", "Admin"))
+        response = self.client.get(reverse('api:admin-clubs-list'))
+        self.assertEqual(response.json(), {
+            'status_code': 400, 'data': "Permission denied: Only overall admin can list clubs."
+        })
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DashboardCacheTest(Fixtures, TestCase):
+    """
+    Cached dashboards are served without queries and follow membership and
+    project changes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = self.create_user()
+        self.club = self.create_club("One", self.user)
+        self.relationship = self.add_admin(self.club, self.user)
+
+    def club_names(self):
+        return [club["club"]["name"] for club in cached_club_head_dashboard(self.user)]
+
+    def test_invalidation(self):
+        self.assertEqual(self.club_names(), ["One"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.club_names(), ["One"])
+
+        other = self.create_club("Two", self.user)
+        self.add_admin(other, self.user)
+        self.assertEqual(sorted(self.club_names()), ["One", "Two"])
+
+        project = Project.objects.create(
+            name="Project", abstract="Abstract", link="https://example.com/project", club=self.club, head=self.user
+        )
+        projects = {club["club"]["name"]: club["projects"] for club in cached_club_head_dashboard(self.user)}
+        self.assertEqual([item["name"] for item in projects["One"]], ["Project"])
+
+        project.club = other
+        project.save()
+        projects = {club["club"]["name"]: club["projects"] for club in cached_club_head_dashboard(self.user)}
+        self.assertEqual((projects["One"], len(projects["Two"])), ([], 1))
+
+        self.relationship.delete()
+        self.assertEqual(self.club_names(), ["Two"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class UserSessionTest(Fixtures, TestCase):
+    """
+    Sessions record their user, so that logging in removes the user's other
+    sessions through an index, and are read from the cache.
+    """
+
+    def create_session(self, user_id):
+        session = SessionStore()
+        session['user_id'] = user_id
+        session.create()
+        return session
+
+    def test_remove_existing_sessions(self):
+        user = self.create_user("user@nitt.edu", "User")
+        other = self.create_user("other@nitt.edu", "Other")
+        for _ in range(3):
+            stale = self.create_session(user.id)
+        kept = self.create_session(other.id)
+        self.assertEqual(UserSession.objects.filter(user=user).count(), 3)
+
+        with self.assertNumQueries(2):
+            remove_existing_sessions(user.id)
+        self.assertEqual(list(UserSession.objects.values_list('session_key', flat=True)), [kept.session_key])
+        # Gone from the cache as well
+        self.assertEqual(SessionStore(stale.session_key).load(), {})
+
+    def test_login(self):
+        user = self.create_user("user@nitt.edu", "User")
+        stale = self.create_session(user.id)
+
+        self.login(user)
+        self.assertFalse(UserSession.objects.filter(pk=stale.session_key).exists())
+        self.assertEqual(UserSession.objects.get(user=user).session_key, self.client.session.session_key)
+
+    def test_admin_request(self):
+        self.login(self.create_user("admin@nitt.edu", "Admin", is_admin=True))
+
+        # The user, then the clubs. The session comes from the cache and is
+        # not queried again by IsAdminDec.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('api:admin-clubs-list'))
+        self.assertEqual(response.resolver_match.func.view_class.__name__, "AdminClubsList")
+        self.assertEqual(response.json(), {'status_code': 200, 'data': [], 'next': None})
+
+    def test_unauthorized_request(self):
+        response = self.client.get(reverse('api:admin-clubs-list'))
+        self.assertEqual(response.json(), unauthorized_response())
+
+        # Logged in as one user, with the session of another
+        admin = self.create_user("admin@nitt.edu", "Admin", is_admin=True)
+        other = self.create_user("other@nitt.edu", "Other")
+        self.login(admin)
+        session = self.client.session
+        self.assertEqual(session['user_id'], admin.id)
+        session['user_id'] = other.id
+        session.save()
+        response = self.client.get(reverse('api:admin-clubs-list'))
+        self.assertEqual(response.json(), unauthorized_response())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PrivilegeResolverTest(Fixtures, TestCase):
+    """
+    The club named in a guarded request and the user's privilege in it are
+    read by one query, which the view reuses.
+    """
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.other = self.create_user("other@nitt.edu", "Other")
+        self.club = self.create_club("One", self.user)
+        self.add_admin(self.club, self.user)
+
+    def resolve(self, user, name):
+        request = RequestFactory().post('/')
+        request.user = user
+        with self.assertNumQueries(1):
+            club = resolve_club(request, name)
+        # Memoized on the request
+        with self.assertNumQueries(0):
+            self.assertIs(resolve_club(request, name), club)
+        return club
+
+    def test_resolve(self):
+        club = self.resolve(self.user, "One")
+        self.assertEqual((club.id, club.access_privilege), (self.club.id, "Admin"))
+        self.assertIsNone(self.resolve(self.other, "One").access_privilege)
+        self.assertIsNone(self.resolve(self.user, "Two"))
+
+    def test_memoized_per_name(self):
+        self.create_club("Two", self.other)
+        request = RequestFactory().post('/')
+        request.user = self.user
+        with self.assertNumQueries(2):
+            self.assertEqual(resolve_club(request, "One").name, "One")
+            self.assertEqual(resolve_club(request, "Two").name, "Two")
+        self.assertEqual(resolve_club.__name__, "resolve_club")
+
+    def test_edit(self):
+        self.login(self.user)
+        response = self.client.post(reverse('api:club-edit'), {'name': "One", 'link': "https://example.org", 'abstract': "New"})
+        self.assertEqual(response.json()['status_code'], 200)
+        self.assertEqual(Club.objects.get(id=self.club.id).abstract, "New")
+
+        response = self.client.post(reverse('api:club-edit'), {'name': "Two", 'link': "https://example.org", 'abstract': "New"})
+        self.assertEqual(response.json()['data'], "Club does not exist")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PrivilegeRegistryTest(TestCase):
+    """
+    Privilege rows are read once per process and follow changes to them.
+    """
+
+    def test_registry(self):
+        admin = ClubMemberPrivilege.objects.get(code=ADMIN)
+        club_privileges.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(club_privileges.id(ADMIN), admin.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(club_privileges.get(ADMIN).name, "Admin")
+            self.assertEqual(club_privileges.name(admin.id), "Admin")
+
+        view = ClubMemberPrivilege.objects.get(code=VIEW)
+        self.assertEqual(club_privileges.id(VIEW), view.id)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MembershipConstraintTest(Fixtures, TestCase):
+    """
+    A user is a member of a club once.
+    """
+
+    def test_unique(self):
+        user = self.create_user()
+        club = self.create_club("One", user)
+        self.add_admin(club, user)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.add_admin(club, user)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StreamingResponseTest(Fixtures, TestCase):
+    """
+    ?stream=true returns the whole collection in the usual envelope,
+    written out in chunks.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_empty(self):
+        response = self.client.get(reverse('api:club-all'), {'stream': 'true'})
+        self.assertEqual(self.content(response), '{"status_code": 200, "data": []}')
+
+    @override_settings(API_STREAM_BUFFER_SIZE=1)
+    def test_admin_clubs(self):
+        for i in range(3):
+            head = self.create_user("head{}@nitt.edu".format(i))
+            self.add_admin(self.create_club("Club {}".format(i), head), head)
+        self.login(self.create_user("admin@nitt.edu", "Admin", is_admin=True))
+
+        response = self.client.get(reverse('api:admin-clubs-list'), {'stream': 'true', 'fields': 'name,admin_count'})
+        chunks = list(response.streaming_content)
+        # One chunk per club past the buffer size, then the closing one
+        self.assertEqual(len(chunks), 4)
+        body = json.loads(b''.join(chunks))
+        self.assertEqual(body["status_code"], 200)
+        self.assertCountEqual(body["data"], [{"name": "Club {}".format(i), "admin_count": 1} for i in range(3)])
+
+
+class CompressionTest(SimpleTestCase):
+    """
+    Responses are compressed with the encoding the client prefers, unless
+    they are small or already encoded.
+    """
+
+    body = json.dumps({'status_code': 200, 'data': ["item {}".format(i) for i in range(100)]}).encode()
+
+    def respond(self, accept_encoding=None, response=None):
+        headers = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding is not None else {}
+        request = RequestFactory().get('/', **headers)
+        if response is None:
+            response = HttpResponse(self.body, content_type='application/json')
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiation(self):
+        response = self.respond('gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+        response = self.respond('gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+        for accept_encoding in (None, 'identity', 'gzip;q=0, br;q=0.0'):
+            response = self.respond(accept_encoding)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertEqual(response.content, self.body)
+            # The response depends on the header all the same
+            self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_small_response(self):
+        response = self.respond('br', HttpResponse(b'{"status_code": 200, "data": []}'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_streaming_response(self):
+        chunks = [self.body[:1000], self.body[1000:]]
+        response = self.respond('gzip', StreamingHttpResponse(iter(chunks), content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.body)
+
+    def test_encoded_response(self):
+        response = HttpResponse(gzip.compress(self.body), content_type='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['ETag'] = '"abc"'
+        response = self.respond('br', response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConditionalGetTest(Fixtures, TestCase):
+    """
+    Clients holding the current version of a response get a 304, and
+    writes change the ETag.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.head = self.create_user()
+        self.club = self.create_club("Club", self.head)
+        self.project = Project.objects.create(
+            name="Project", abstract="Abstract", link="https://example.com/project", club=self.club, head=self.head
+        )
+
+    def etag(self, view, **kwargs):
+        response = self.client.get(reverse(view, kwargs=kwargs))
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_if_none_match(self):
+        for view, kwargs in [
+            ('api:projects-all', {}), ('api:club-all', {}),
+            ('api:project-detail', {'project_name': "Project"}), ('api:club-detail', {'club_name': "Club"}),
+        ]:
+            etag = self.etag(view, **kwargs)
+            response = self.client.get(reverse(view, kwargs=kwargs), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, view)
+            self.assertEqual(response.content, b'')
+
+            response = self.client.get(reverse(view, kwargs=kwargs), HTTP_IF_NONE_MATCH='"stale"')
+            self.assertEqual(response.status_code, 200, view)
+
+    def test_if_modified_since(self):
+        url = reverse('api:project-detail', kwargs={'project_name': "Project"})
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() - 3600)).status_code, 200)
+
+    def test_etag_changes(self):
+        etag = self.etag('api:projects-all')
+        other = Project.objects.create(
+            name="Other", abstract="Abstract", link="https://example.com/other", club=self.club, head=self.head
+        )
+        self.assertNotEqual(self.etag('api:projects-all'), etag)
+
+        etag = self.etag('api:projects-all')
+        other.delete()
+        self.assertNotEqual(self.etag('api:projects-all'), etag)
+
+        etag = self.etag('api:project-detail', project_name="Project")
+        member = ProjectMember.objects.create(project=self.project, name="Member")
+        self.assertNotEqual(self.etag('api:project-detail', project_name="Project"), etag)
+
+        etag = self.etag('api:project-detail', project_name="Project")
+        member.delete()
+        self.assertNotEqual(self.etag('api:project-detail', project_name="Project"), etag)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheInvalidationTest(Fixtures, TestCase):
+    """
+    Saving or deleting a project, club, project member or head invalidates
+    the cached listings and details showing it, under its old name as well
+    after a rename.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.head = self.create_user()
+        self.club = self.create_club("Club", self.head)
+        self.project = Project.objects.create(
+            name="Project", abstract="Abstract", link="https://example.com/project", club=self.club, head=self.head
+        )
+
+    def get(self, view, params=None, **kwargs):
+        return self.client.get(reverse(view, kwargs=kwargs), params).json()['data']
+
+    def cached(self, view, params=None, **kwargs):
+        # Read once to cache it, then answered from the cache
+        data = self.get(view, params, **kwargs)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(view, params, **kwargs), data)
+        return data
+
+    def project_names(self):
+        return [(project['name'], project['club_name']) for project in self.get('api:projects-all', {'fields': "name,club_name"})]
+
+    def test_project(self):
+        self.cached('api:projects-all', {'fields': "name,club_name"})
+        self.cached('api:project-detail', project_name="Project")
+
+        self.project.abstract = "New"
+        self.project.save()
+        self.assertEqual(self.get('api:project-detail', project_name="Project")['abstract'], "New")
+
+        self.cached('api:project-detail', project_name="Project")
+        self.project.name = "Renamed"
+        self.project.save()
+        self.assertEqual(self.project_names(), [("Renamed", "Club")])
+        self.assertEqual(self.get('api:project-detail', project_name="Project"), "Project does not exist")
+        self.assertEqual(self.get('api:project-detail', project_name="Renamed")['name'], "Renamed")
+
+        self.cached('api:project-detail', project_name="Renamed")
+        self.project.delete()
+        self.assertEqual(self.project_names(), [])
+        self.assertEqual(self.get('api:project-detail', project_name="Renamed"), "Project does not exist")
+
+    def test_club(self):
+        self.cached('api:projects-all', {'fields': "name,club_name"})
+        self.cached('api:club-all', {'fields': "name"})
+        self.cached('api:club-detail', club_name="Club")
+
+        self.club.name = "Renamed"
+        self.club.save()
+        # Project listings show the club name
+        self.assertEqual(self.project_names(), [("Project", "Renamed")])
+        self.assertEqual(self.get('api:club-all', {'fields': "name"}), [{'name': "Renamed"}])
+        self.assertEqual(self.get('api:club-detail', club_name="Club"), "Club does not exist")
+        self.assertEqual(self.get('api:club-detail', club_name="Renamed")['name'], "Renamed")
+
+        self.project.delete()
+        self.cached('api:club-all', {'fields': "name"})
+        self.club.delete()
+        self.assertEqual(self.get('api:club-all', {'fields': "name"}), [])
+        self.assertEqual(self.get('api:club-detail', club_name="Renamed"), "Club does not exist")
+
+    def test_project_member(self):
+        self.cached('api:project-detail', project_name="Project")
+        member = ProjectMember.objects.create(project=self.project, name="Member")
+        self.assertEqual(
+            [item['name'] for item in self.get('api:project-detail', project_name="Project")['members']], ["Member"]
+        )
+
+        self.cached('api:project-detail', project_name="Project")
+        member.delete()
+        self.assertEqual(self.get('api:project-detail', project_name="Project")['members'], [])
+
+    def test_head(self):
+        self.cached('api:project-detail', project_name="Project")
+        self.cached('api:club-detail', club_name="Club")
+
+        # Logging in only sets last_login, which leaves the cache alone
+        self.login(self.head)
+        self.cached('api:project-detail', project_name="Project")
+
+        self.head.email = "new@nitt.edu"
+        self.head.save()
+        self.assertEqual(self.get('api:project-detail', project_name="Project")['email'], "new@nitt.edu")
+        self.assertEqual(self.get('api:club-detail', club_name="Club")['email'], "new@nitt.edu")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PrecompressedCacheTest(Fixtures, TestCase):
+    """
+    Cached responses are stored along with their compressed variants and
+    served in the encoding the client accepts.
+    """
+
+    def setUp(self):
+        cache.clear()
+        head = self.create_user()
+        for i in range(5):
+            self.create_club("Club {}".format(i), head, abstract="Abstract " * 10)
+
+    def test_variants(self):
+        plain = self.client.get(reverse('api:club-all'))
+        self.assertFalse(plain.has_header('Content-Encoding'))
+
+        # Served from the cache, without querying the clubs again
+        with self.assertNumQueries(0):
+            compressed = self.client.get(reverse('api:club-all'), HTTP_ACCEPT_ENCODING='br')
+        self.assertEqual(compressed['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed['Vary'], 'Accept-Encoding')
+        self.assertTrue(compressed['ETag'].startswith('W/'))
+
+        compressed = self.client.get(reverse('api:club-all'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
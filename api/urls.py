@@ -1,5 +1,5 @@
 from django.urls import re_path as url
-from .views import user, project, club, admin
+from .views import user, project, club, admin, search, home
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -30,25 +30,37 @@ urlpatterns = [
     url('project/search', project.Search.as_view(), name='project-search'),
     # create route 
     url('project/create', project.Create.as_view(), name='project-create'),
-    url(r'^project/(?P<project_name>[\w\s-]+)$', project.ProjectDetail.as_view(), name='project-detail'),
     # edit route 
-    url('project/edit', project.Edit.as_view(), name='project-edit'),
-    #Tags
-    # url('project/tags', project.Tags.as_view(), name='tags'),
+    url(r'^project/edit$', project.Edit.as_view(), name='project-edit'),
+    # technologies used by projects and counts per club and technology,
+    # and batch details, must come before the detail route, as must edit
+    url(r'^project/tags$', project.Tags.as_view(), name='project-tags'),
+    url(r'^project/facets$', project.Facets.as_view(), name='project-facets'),
+    url(r'^project/batch$', project.Batch.as_view(), name='project-batch'),
+    url(r'^project/(?P<project_name>[\w\s-]+)$', project.ProjectDetail.as_view(), name='project-detail'),
 
 	# Club routes
     #search route: pass a parameter type (name) and value
-    url('clubs', club.AllClubs.as_view(), name='club-all'),
+    # anchored, else it would also match admin/clubs
+    url(r'^clubs$', club.AllClubs.as_view(), name='club-all'),
     url('club/search', club.Search.as_view(), name='club-search'),
     # create route 
     url('club/create', club.Create.as_view(), name='club-create'),
-    url(r'^club/(?P<club_name>[\w\s-]+)$', club.ClubDetail.as_view(), name='club-detail'),
     # edit route 
-    url('club/edit', club.Edit.as_view(), name='club-edit'),
+    url(r'^club/edit$', club.Edit.as_view(), name='club-edit'),
+    # batch details, must come before the detail route, as must edit
+    url(r'^club/batch$', club.Batch.as_view(), name='club-batch'),
+    url(r'^club/(?P<club_name>[\w\s-]+)$', club.ClubDetail.as_view(), name='club-detail'),
 
     #Tags
     # url('club/tags', club.Tags.as_view(), name='tags'),
 
+    # Landing page
+    url(r'^home$', home.Homepage.as_view(), name='home'),
+
+    # Search routes
+    url('autocomplete', search.Autocomplete.as_view(), name='autocomplete'),
+
     # Overall Admin Endpoints
     url('admin/club/assign_head/', admin.AdminAssignClubHead.as_view(), name='admin-assign-club-head'),
     url('admin/club/remove_head/', admin.AdminRemoveClubHead.as_view(), name='admin-remove-club-head'),
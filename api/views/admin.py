@@ -5,7 +5,12 @@ from django.utils.decorators import method_decorator
 from api.decorators.response import JsonResponseDec
 from api.decorators.club_permissions import IsAdminDec, CheckAccessPrivilegeDec
 from api.controllers.response_format import error_response
-from api.models import Club, User, ClubMemberRelationship, ClubMemberPrivilege, Project
+from api.controllers.pagination import paginate, stream, stream_requested
+from api.controllers.serializers import parse_fields
+from api.controllers.admin_utilities import ADMIN_CLUB_FIELDS, admin_club_serializer, admin_clubs, cached_admin_club_detail
+from api.controllers.dashboard_utilities import cached_club_head_dashboard
+from api.controllers.privileges import ADMIN, club_privileges
+from api.models import Club, User, ClubMemberRelationship
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +50,7 @@ class AdminAssignClubHead(View):
             club.save()
             
             # Ensure a ClubMemberRelationship exists with "Admin" privilege
-            privilege = ClubMemberPrivilege.objects.get(name="Admin")
+            privilege = club_privileges.get(ADMIN)
             relationship, created = ClubMemberRelationship.objects.get_or_create(
                 club=club, 
                 user=new_head, 
@@ -118,17 +123,13 @@ class ClubHeadAssignClubHead(View):
           user has "Admin" privilege in that club.
     """
     def post(self, request):
-        name = request.POST.get("name")
         new_head_email = request.POST.get("user_email")
         
         # Ensure the current user has club admin privileges for this club.
         if request.access_privilege != "Admin":
             return error_response("Permission denied: You do not have admin privileges in this club.")
         
-        try:
-            club = Club.objects.get(name=name)
-        except Club.DoesNotExist:
-            return error_response("Club does not exist.")
+        club = request.club
         
         try:
             new_head = User.objects.get(email=new_head_email)
@@ -136,7 +137,7 @@ class ClubHeadAssignClubHead(View):
             return error_response("User does not exist.")
         
         try:
-            privilege = ClubMemberPrivilege.objects.get(name="Admin")
+            privilege = club_privileges.get(ADMIN)
             relationship, created = ClubMemberRelationship.objects.get_or_create(
                 club=club, 
                 user=new_head, 
@@ -161,16 +162,12 @@ class ClubHeadRemoveClubHead(View):
       - user_email: email of the club head to remove
     """
     def post(self, request):
-        name = request.POST.get("name")
         head_email = request.POST.get("user_email")
         
         if request.access_privilege != "Admin":
             return error_response("Permission denied: You do not have admin privileges in this club.")
         
-        try:
-            club = Club.objects.get(name=name)
-        except Club.DoesNotExist:
-            return error_response("Club does not exist.")
+        club = request.club
         
         try:
             user = User.objects.get(email=head_email)
@@ -198,22 +195,31 @@ class ClubHeadRemoveClubHead(View):
 @method_decorator(IsAdminDec, name='dispatch')
 class AdminClubsList(View):
     """
-    GET: Lists all clubs.
+    GET: Lists clubs, one page at a time, with their number of projects
+         and of admins.
+         With ?stream=true every club is streamed instead.
+         With ?fields=name,project_count only the listed fields are returned.
     Route: admin/clubs
     """
     def get(self, request):
-        clubs = Club.objects.all()
-        clubs_data = []
-        for club in clubs:
-            clubs_data.append({
-                "id": club.id,
-                "name": club.name,
-                "abstract": club.abstract,
-                "link": club.link,
-                "image": club.image.url if club.image else None,
-                "head": club.head.email if club.head else None
-            })
-        return {"data": clubs_data}
+        if not request.is_admin:
+            return error_response("Permission denied: Only overall admin can list clubs.")
+        try:
+            fields = parse_fields(request.GET, ADMIN_CLUB_FIELDS)
+        except ValueError:
+            return error_response("Invalid fields")
+
+        clubs, serialize = admin_club_serializer.rows(admin_clubs(), fields)
+        if stream_requested(request.GET):
+            return {"data": stream(clubs, serialize)}
+        try:
+            clubs, next_cursor = paginate(clubs, request.GET)
+        except ValueError:
+            return error_response("Invalid cursor or page size")
+        return {
+            "data": [serialize(club) for club in clubs],
+            "next": next_cursor
+        }
 
 
 @method_decorator(JsonResponseDec, name='dispatch')
@@ -221,51 +227,26 @@ class AdminClubsList(View):
 class AdminClubDetail(View):
     """
     GET: Returns details for a specific club.
-         It includes club details, current admin users (club heads),
-         and projects associated with the club.
+         It includes club details with its number of projects and admins,
+         current admin users (club heads), and one page of the projects
+         associated with the club (see ?cursor= and ?page_size=).
+         With ?fields= only the listed club fields are returned.
+         Cached until the club, its admins or its projects change.
     Route: admin/club/<name>
     """
     def get(self, request, name):
+        if not request.is_admin:
+            return error_response("Permission denied: Only overall admin can view club details.")
         try:
-            club = Club.objects.get(name=name)
-        except Club.DoesNotExist:
+            fields = parse_fields(request.GET, ADMIN_CLUB_FIELDS)
+        except ValueError:
+            return error_response("Invalid fields")
+        try:
+            club_data = cached_admin_club_detail(name, request.GET, fields)
+        except ValueError:
+            return error_response("Invalid cursor or page size")
+        if club_data is None:
             return error_response("Club does not exist.")
-        
-        # Get all club heads (i.e. members with 'Admin' privilege) for the club.
-        admin_relationships = ClubMemberRelationship.objects.filter(
-            club=club, privilege__name="Admin"
-        )
-        admin_users = []
-        for rel in admin_relationships:
-            admin_users.append({
-                "id": rel.user.id,
-                "email": rel.user.email,
-                "name": rel.user.name
-            })
-        
-        # Get projects associated with the club.
-        projects_qs = Project.objects.filter(club=club)
-        projects = []
-        for project in projects_qs:
-            projects.append({
-                "id": project.id,
-                "name": project.name,
-                "abstract": project.abstract,
-                "link": project.link,
-                "image": project.image.url if project.image else None,
-                "head": project.head.email if project.head else None
-            })
-        
-        club_data = {
-            "id": club.id,
-            "name": club.name,
-            "abstract": club.abstract,
-            "link": club.link,
-            "image": club.image.url if club.image else None,
-            "head": club.head.email if club.head else None,
-            "admin_users": admin_users,
-            "projects": projects
-        }
         return {"data": club_data}
 
 # ------------------------------
@@ -281,53 +262,8 @@ class ClubHeadDashboard(View):
            - Club details.
            - All current club heads (members with Admin privilege).
            - All projects associated with that club.
+         Cached per user until one of those changes.
     Route: ${backendUrl}/club_head/
     """
     def get(self, request):
-        user = request.user
-        # Find clubs where the user has an admin relationship.
-        relationships = ClubMemberRelationship.objects.filter(
-            user=user, privilege__name="Admin"
-        )
-        dashboard_data = []
-        for rel in relationships:
-            club = rel.club
-            
-            # Get all club heads for this club.
-            club_heads_qs = ClubMemberRelationship.objects.filter(
-                club=club, privilege__name="Admin"
-            )
-            club_heads = []
-            for ch in club_heads_qs:
-                club_heads.append({
-                    "id": ch.user.id,
-                    "email": ch.user.email,
-                    "name": ch.user.name
-                })
-            
-            # Get projects for the club.
-            projects_qs = Project.objects.filter(club=club)
-            projects = []
-            for project in projects_qs:
-                projects.append({
-                    "id": project.id,
-                    "name": project.name,
-                    "abstract": project.abstract,
-                    "link": project.link,
-                    "image": project.image.url if project.image else None,
-                    "head": project.head.email if project.head else None
-                })
-            
-            dashboard_data.append({
-                "club": {
-                    "id": club.id,
-                    "name": club.name,
-                    "abstract": club.abstract,
-                    "link": club.link,
-                    "image": club.image.url if club.image else None,
-                    "head": club.head.email if club.head else None
-                },
-                "club_heads": club_heads,
-                "projects": projects
-            })
-        return {"data": dashboard_data}
+        return {"data": cached_club_head_dashboard(request.user)}
@@ -1,81 +1,129 @@
 from django.utils.decorators import method_decorator
 from django.views.generic import View
-from api.decorators.response import JsonResponseDec
+from django.views.decorators.http import condition
+from api.decorators.response import JsonResponseDec, CachedJsonResponseDec
 from api.decorators.club_permissions import IsAdminDec, CheckAccessPrivilegeDec
 from api.models import Club, User
 from api.controllers.response_format import error_response
-from api.controllers.club_utilities import create_club
+from api.controllers.club_utilities import club_detail, club_details, create_club
+from api.controllers.batch_utilities import batch_results, parse_batch
+from api.controllers.pagination import RANK_KEYSET, paginate, paginate_ids, stream, stream_requested
+from api.controllers.search_index import in_order, memory_search_enabled, search_index
+from api.controllers.search_utilities import fuzzy_search_clubs, mode_search, search_clubs
+from api.controllers.serializers import CLUB_FIELDS, parse_fields, club_serializer
+from api.controllers.etags import clubs_etag, club_detail_etag, club_detail_last_modified
+from api.controllers.cache_utilities import response_cache_key
 from django.core.files.storage import FileSystemStorage
-from django.db.models import Q
 import logging
 
 logger = logging.getLogger(__name__)
-from django.forms.models import model_to_dict
 
-def list_to_dict(items):
-    '''
-    Converts a given QuerySet into a list of dictionaries.
-    For each item, replace the image field with its URL if it exists.
-    Additionally, add club_name if the object has a club relation.
-    '''
-    converted = []
-    for item in items:
-        new_item = model_to_dict(item)
-        
-        # Handle image field: replace with URL or set to None
-        if hasattr(item, 'image'):
-            new_item["image"] = item.image.url if item.image else None
-        else:
-            new_item["image"] = None
-        
-        # If the object has a 'club' attribute, add the club name
-        if hasattr(item, 'club'):
-            new_item["club_name"] = item.club.name if item.club else None
-
-        converted.append(new_item)
-    return converted
-
-@method_decorator(JsonResponseDec, name='dispatch')
+@method_decorator(condition(etag_func=clubs_etag), name='dispatch')
+@method_decorator(CachedJsonResponseDec(response_cache_key('clubs')), name='dispatch')
 class AllClubs(View):
     """
-    Return all Clubs
+    Return all Clubs, one page at a time.
+    With ?stream=true, streams every club in a single response instead.
+    With ?fields=name,image only the listed fields are read and returned.
     """
     def get(self, req):
-        clubs = Club.objects.all()
+        try:
+            fields = parse_fields(req.GET, CLUB_FIELDS)
+        except ValueError:
+            return error_response("Invalid fields")
+
+        clubs, serialize = club_serializer.rows(Club.objects.all(), fields)
+
+        if stream_requested(req.GET):
+            return {
+                'data': stream(clubs, serialize)
+            }
+        try:
+            clubs, next_cursor = paginate(clubs, req.GET)
+        except ValueError:
+            return error_response("Invalid cursor or page size")
         return {
-            'data': list_to_dict(clubs)
+            'data': [serialize(club) for club in clubs],
+            'next': next_cursor
         }
     
 
-@method_decorator(JsonResponseDec, name='dispatch')
+@method_decorator(condition(etag_func=club_detail_etag, last_modified_func=club_detail_last_modified), name='dispatch')
+@method_decorator(CachedJsonResponseDec(response_cache_key('club:{club_name}')), name='dispatch')
 class ClubDetail(View):
     """
     Returns the details of a single club identified by its name.
     """
 
     def get(self, req, club_name):
-        try:
-            club = Club.objects.get(name=club_name)
-        except Club.DoesNotExist:
+        club = club_detail(club_name)
+        if club is None:
             return error_response("Club does not exist")
-        response_data = {
-            "id": club.id,
-            "name": club.name,
-            "email": club.head.email,
-            "abstract": club.abstract,
-            "link": club.link,
-            "image": club.image.url if club.image else None
-        }
-        
-        return response_data
+        return club
 
 @method_decorator(JsonResponseDec, name='dispatch')
+class Batch(View):
+    """
+    Returns the details of many clubs in one response, read in
+    a single query whatever their number.
+    Clubs are given by name (?name=a&name=b) or by id (?id=1&id=2).
+    Returns one result per club, in request order, holding either its
+    details or an error if it does not exist.
+    """
+    def get(self, req):
+        try:
+            lookup, values = parse_batch(req.GET)
+        except ValueError as e:
+            return error_response(str(e))
+        return {
+            'data': batch_results(lookup, values, club_details(lookup, values), "Club does not exist")
+        }
+
+@method_decorator(CachedJsonResponseDec(response_cache_key('clubs')), name='dispatch')
 class Search(View):
+    """
+    Full text search over club and head names and the abstract,
+    best matches first.
+    With ?mode=fuzzy, matches names by trigram word similarity instead,
+    which tolerates typos. ?threshold= sets the minimum similarity.
+    With SEARCH_BACKEND = 'memory', full text search is answered from the
+    in-process index, newest first, and only the page is read from the db.
+    """
     def get(self, req):
         query = req.GET.get("query")
-        clubs = Club.objects.filter(Q(head__name__unaccent__icontains = query) | Q(name__unaccent__icontains=query))
+        if not query:
+            return error_response("Search query is required")
+        try:
+            fields = parse_fields(req.GET, CLUB_FIELDS)
+        except ValueError:
+            return error_response("Invalid fields")
+
+        mode = req.GET.get("mode", "fulltext")
+        if mode == "fulltext" and memory_search_enabled():
+            try:
+                ids, next_cursor = paginate_ids(search_index.search_clubs(query), req.GET)
+            except ValueError:
+                return error_response("Invalid cursor or page size")
+            clubs, serialize = club_serializer.rows(Club.objects.filter(id__in=ids), fields)
+            return {
+                'data': [serialize(row) for row in in_order(clubs, ids)],
+                'next': next_cursor
+            }
+
+        try:
+            clubs, scope = mode_search(req.GET, search_clubs, fuzzy_search_clubs)
+        except ValueError as e:
+            return error_response(str(e))
+
+        clubs, serialize = club_serializer.rows(clubs, fields, extra=('rank',))
+        try:
+            with scope:
+                clubs, next_cursor = paginate(clubs, req.GET, keyset=RANK_KEYSET)
+        except ValueError:
+            return error_response("Invalid cursor or page size")
         return {
-            'data': list_to_dict(clubs)
+            'data': [serialize(club) for club in clubs],
+            'next': next_cursor
         }
 
 class Tags(View):
@@ -128,17 +176,13 @@ class Edit(View):
         2. link
     """
     def post(self, req):
-        name = req.POST.get("name")
         link = req.POST.get("link")
         abstract = req.POST.get("abstract")
         if not (req.access_privilege == "Edit" or req.access_privilege == "Admin" ):
             return error_response("USER DOESN'T HAVE EDIT ACCESS")
-        try:
-            club = Club.objects.get(name=name)
-            club.link = link
-            club.abstract = abstract
-            club.save()
-            logger.info('Club(name={}) update successful'.format(club.name))
-            return "Club updated successfully!"
-        except Club.DoesNotExist:
-            return error_response("Club doesn't exist")
\ No newline at end of file
+        club = req.club
+        club.link = link
+        club.abstract = abstract
+        club.save()
+        logger.info('Club(name={}) update successful'.format(club.name))
+        return "Club updated successfully!"
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.utils.decorators import method_decorator
+from django.views.generic import View
+from api.decorators.response import CachedJsonResponseDec
+from api.controllers.home_utilities import homepage
+from api.controllers.cache_utilities import response_cache_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@method_decorator(CachedJsonResponseDec(response_cache_key('clubs', 'projects')), name='dispatch')
+class Homepage(View):
+    """
+    Returns everything the landing page shows in one response: every club
+    with its number of projects and its latest projects
+    (HOMEPAGE_RECENT_PROJECTS of them). Cached as a whole until a club or
+    project changes.
+    """
+    def get(self, req):
+        return {
+            'data': homepage()
+        }
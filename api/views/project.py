@@ -1,108 +1,199 @@
+from contextlib import nullcontext
 from django.utils.decorators import method_decorator
 from django.views.generic import View
-from api.decorators.response import JsonResponseDec
+from django.views.decorators.http import condition
+from api.decorators.response import JsonResponseDec, CachedJsonResponseDec
 from api.decorators.project_permissions import IsAdminDec, CheckAccessPrivilegeDec
 from api.models import Project, User, Club, ProjectMember
 from api.controllers.response_format import error_response
-from api.controllers.project_utilities import create_project
+from api.controllers.project_utilities import create_project, project_detail, project_details
+from api.controllers.batch_utilities import batch_results, parse_batch
+from api.controllers.pagination import RANK_KEYSET, paginate, paginate_ids, stream, stream_requested
+from api.controllers.search_index import in_order, memory_search_enabled, search_index
+from api.controllers.search_utilities import fuzzy_search_projects, mode_search, search_projects
+from api.controllers.serializers import PROJECT_FIELDS, parse_fields, project_serializer
+from api.controllers.tech_utilities import filter_tech, parse_tech, save_techstack, tech_counts
+from api.controllers.facet_utilities import project_facets
+from api.controllers.etags import projects_etag, project_detail_etag, project_detail_last_modified
+from api.controllers.cache_utilities import response_cache_key
 from django.core.files.storage import FileSystemStorage
-from django.db.models import Q
 import logging
-from django.forms.models import model_to_dict
 
 logger = logging.getLogger(__name__)
 
 
-def list_to_dict(items):
-    '''
-    Converts a given QuerySet into a list of dictionaries.
-    For each item, if it has an image, replaces it with its URL.
-    Also, if the item has a related club, adds the club's name.
-    Additionally, includes the techstack list.
-    '''
-    converted = []
-    for item in items:
-        new_item = model_to_dict(item)
-        
-        # Replace the image field with its URL if it exists
-        if hasattr(item, 'image'):
-            new_item["image"] = item.image.url if item.image else None
-        else:
-            new_item["image"] = None
-        
-        # If the object has a 'club' attribute, add the club name
-        if hasattr(item, 'club'):
-            new_item["club_name"] = item.club.name if item.club else None
-
-        # Add the techstack field
-        new_item["techstack"] = item.techstack
-        
-        converted.append(new_item)
-    return converted
-
-
-@method_decorator(JsonResponseDec, name='dispatch')
+@method_decorator(condition(etag_func=projects_etag), name='dispatch')
+@method_decorator(CachedJsonResponseDec(response_cache_key('projects')), name='dispatch')
 class AllProjects(View):
     """
-    Return all Projects
+    Return all Projects, one page at a time.
+    With ?stream=true, streams every project in a single response instead.
+    With ?fields=name,image only the listed fields are read and returned.
+    With ?tech=react,django only projects using all of them are returned.
     """
     def get(self, req):
-        projects = Project.objects.all()
+        try:
+            fields = parse_fields(req.GET, PROJECT_FIELDS)
+        except ValueError:
+            return error_response("Invalid fields")
+        try:
+            tech = parse_tech(req.GET)
+        except ValueError:
+            return error_response("Invalid tech")
+
+        projects, serialize = project_serializer.rows(filter_tech(Project.objects.all(), tech), fields)
+        if stream_requested(req.GET):
+            return {
+                'data': stream(projects, serialize)
+            }
+        try:
+            projects, next_cursor = paginate(projects, req.GET)
+        except ValueError:
+            return error_response("Invalid cursor or page size")
         return {
-            'data': list_to_dict(projects)
+            'data': [serialize(project) for project in projects],
+            'next': next_cursor
         }
     
 
-@method_decorator(JsonResponseDec, name='dispatch')
+@method_decorator(condition(etag_func=project_detail_etag, last_modified_func=project_detail_last_modified), name='dispatch')
+@method_decorator(CachedJsonResponseDec(response_cache_key('project:{project_name}')), name='dispatch')
 class ProjectDetail(View):
     """
     Returns the details of a single project identified by its name.
     """
     def get(self, req, project_name):
-        try:
-            project = Project.objects.get(name=project_name)
-        except Project.DoesNotExist:
+        project = project_detail(project_name)
+        if project is None:
             return error_response("Project does not exist")
-        
-        members_qs = project.members.all()
-        members_data = []
-        for member in members_qs:
-            members_data.append({
-                "name": member.name,
-                "profile_pic": member.profile_pic.url if member.profile_pic else None
-            })
-        
-        response_data = {
-            "id": project.id,
-            "name": project.name,
-            "email": project.head.email,
-            "abstract": project.abstract,
-            "link": project.link,
-            "image": project.image.url if project.image else None,
-            "techstack": project.techstack,
-            "members": members_data
-        }
-        return response_data
-    
+        return project
 
 
 @method_decorator(JsonResponseDec, name='dispatch')
+class Batch(View):
+    """
+    Returns the details of many projects, members included, in one response, read in
+    two queries whatever their number.
+    Projects are given by name (?name=a&name=b) or by id (?id=1&id=2).
+    Returns one result per project, in request order, holding either its
+    details or an error if it does not exist.
+    """
+    def get(self, req):
+        try:
+            lookup, values = parse_batch(req.GET)
+        except ValueError as e:
+            return error_response(str(e))
+        return {
+            'data': batch_results(lookup, values, project_details(lookup, values), "Project does not exist")
+        }
+
+
+@method_decorator(CachedJsonResponseDec(response_cache_key('projects')), name='dispatch')
 class Search(View):
+    """
+    Full text search over project, club and head names and the abstract,
+    best matches first.
+    With ?mode=fuzzy, matches names by trigram word similarity instead,
+    which tolerates typos. ?threshold= sets the minimum similarity.
+    With SEARCH_BACKEND = 'memory', full text search is answered from the
+    in-process index, newest first, and only the page is read from the db.
+    ?tech= filters the results like on the project listing.
+    """
     def get(self, req):
         query = req.GET.get("query")
-        projects = Project.objects.filter(
-            Q(head__name__unaccent__icontains=query) | 
-            Q(name__unaccent__icontains=query) | 
-            Q(club__name__unaccent__icontains=query)
-        )
+        if not query:
+            return error_response("Search query is required")
+        try:
+            fields = parse_fields(req.GET, PROJECT_FIELDS)
+        except ValueError:
+            return error_response("Invalid fields")
+        try:
+            tech = parse_tech(req.GET)
+        except ValueError:
+            return error_response("Invalid tech")
+
+        mode = req.GET.get("mode", "fulltext")
+        if mode == "fulltext" and memory_search_enabled():
+            try:
+                ids, next_cursor = paginate_ids(search_index.search_projects(query, tech), req.GET)
+            except ValueError:
+                return error_response("Invalid cursor or page size")
+            projects, serialize = project_serializer.rows(Project.objects.filter(id__in=ids), fields)
+            return {
+                'data': [serialize(row) for row in in_order(projects, ids)],
+                'next': next_cursor
+            }
+
+        try:
+            projects, scope = mode_search(req.GET, search_projects, fuzzy_search_projects)
+        except ValueError as e:
+            return error_response(str(e))
+
+        projects, serialize = project_serializer.rows(filter_tech(projects, tech), fields, extra=('rank',))
+        try:
+            with scope:
+                projects, next_cursor = paginate(projects, req.GET, keyset=RANK_KEYSET)
+        except ValueError:
+            return error_response("Invalid cursor or page size")
         return {
-            'data': list_to_dict(projects)
+            'data': [serialize(project) for project in projects],
+            'next': next_cursor
         }
 
 
+@method_decorator(condition(etag_func=projects_etag), name='dispatch')
+@method_decorator(CachedJsonResponseDec(response_cache_key('projects')), name='dispatch')
 class Tags(View):
+    """
+    Returns every technology used by projects with the number of projects
+    using it, most used first.
+    With ?tech=, counts only the projects using all the given technologies,
+    to narrow a selection down.
+    """
     def get(self, req):
-        pass
+        try:
+            tech = parse_tech(req.GET)
+        except ValueError:
+            return error_response("Invalid tech")
+        return {
+            'data': tech_counts(filter_tech(Project.objects.all(), tech))
+        }
+
+
+@method_decorator(condition(etag_func=projects_etag), name='dispatch')
+@method_decorator(CachedJsonResponseDec(response_cache_key('projects')), name='dispatch')
+class Facets(View):
+    """
+    Returns the number of projects per club and per technology.
+    Takes the filters of search (?query=, ?mode=, ?threshold=, ?tech=), so
+    the counts match the results being shown. Without them, counts every
+    project. Like search, full text queries are answered from the
+    in-process index with SEARCH_BACKEND = 'memory'.
+    """
+    def get(self, req):
+        try:
+            tech = parse_tech(req.GET)
+        except ValueError:
+            return error_response("Invalid tech")
+
+        query = req.GET.get("query")
+        if query and req.GET.get("mode", "fulltext") == "fulltext" and memory_search_enabled():
+            ids = search_index.search_projects(query, tech)
+            return {
+                'data': project_facets(Project.objects.filter(id__in=ids))
+            }
+
+        projects, scope = Project.objects.all(), nullcontext()
+        if query:
+            try:
+                projects, scope = mode_search(req.GET, search_projects, fuzzy_search_projects)
+            except ValueError as e:
+                return error_response(str(e))
+
+        with scope:
+            return {
+                'data': project_facets(filter_tech(projects, tech))
+            }
 
 
 @method_decorator(JsonResponseDec, name='dispatch')
@@ -157,17 +248,14 @@ class Create(View):
                 return error_response("Invalid members data format: " + str(e))
         
         # Handle techstack images (multiple file upload)
-        techstack_list = []
-        if "techstack" in req.FILES:
-            techstack_files = req.FILES.getlist("techstack")
-            for tech_file in techstack_files:
-                tech_filename = fs.save(tech_file.name, tech_file)
-                uploaded_tech_url = fs.url(tech_filename)
-                techstack_list.append(uploaded_tech_url)
+        techstack_list, techstack_tags = save_techstack(req.FILES.getlist("techstack"))
         
         try:
             # Pass techstack_list to the create_project helper (make sure its signature accepts it)
-            if create_project(name, abstract, link, user, uploaded_file_url, club, members=members, techstack=techstack_list):
+            if create_project(
+                name, abstract, link, user, uploaded_file_url, club,
+                members=members, techstack=techstack_list, tech_tags=techstack_tags
+            ):
                 logger.info('Project(name={}) creation successful'.format(name))
                 return "Project created successfully!"
             else:
@@ -187,50 +275,39 @@ class Edit(View):
     Also supports updating the techstack images.
     """
     def post(self, req):
-        name = req.POST.get("name")
         link = req.POST.get("link")
         abstract = req.POST.get("abstract")
         if not (req.access_privilege == "Edit" or req.access_privilege == "Admin"):
             return error_response("USER DOESN'T HAVE EDIT ACCESS")
-        try:
-            project = Project.objects.get(name=name)
-            project.link = link
-            project.abstract = abstract
-
-            # Update techstack if provided
-            fs = FileSystemStorage()
-            techstack_list = []
-            if "techstack" in req.FILES:
-                techstack_files = req.FILES.getlist("techstack")
-                for tech_file in techstack_files:
-                    tech_filename = fs.save(tech_file.name, tech_file)
-                    uploaded_tech_url = fs.url(tech_filename)
-                    techstack_list.append(uploaded_tech_url)
-                project.techstack = techstack_list
-
-            project.save()
-
-            import json
-            members_json = req.POST.get("members")
-            if members_json:
-                try:
-                    members = json.loads(members_json)
-                    # Option: Remove existing members and add the new list
-                    project.members.all().delete()
-                    for member_data in members:
-                        profile_pic_key = member_data.get("profile_pic")
-                        if profile_pic_key and profile_pic_key in req.FILES:
-                            profile_pic = req.FILES[profile_pic_key]
-                        else:
-                            profile_pic = None
-                        ProjectMember.objects.create(
-                            project=project,
-                            name=member_data.get("name"),
-                            profile_pic=profile_pic
-                        )
-                except Exception as e:
-                    return error_response("Invalid members data format: " + str(e))
-            logger.info('Project(name={}) update successful'.format(project.name))
-            return "Project updated successfully!"
-        except Project.DoesNotExist:
-            return error_response("Project doesn't exist")
+        project = req.project
+        project.link = link
+        project.abstract = abstract
+
+        # Update techstack if provided
+        if "techstack" in req.FILES:
+            project.techstack, project.tech_tags = save_techstack(req.FILES.getlist("techstack"))
+
+        project.save()
+
+        import json
+        members_json = req.POST.get("members")
+        if members_json:
+            try:
+                members = json.loads(members_json)
+                # Option: Remove existing members and add the new list
+                project.members.all().delete()
+                for member_data in members:
+                    profile_pic_key = member_data.get("profile_pic")
+                    if profile_pic_key and profile_pic_key in req.FILES:
+                        profile_pic = req.FILES[profile_pic_key]
+                    else:
+                        profile_pic = None
+                    ProjectMember.objects.create(
+                        project=project,
+                        name=member_data.get("name"),
+                        profile_pic=profile_pic
+                    )
+            except Exception as e:
+                return error_response("Invalid members data format: " + str(e))
+        logger.info('Project(name={}) update successful'.format(project.name))
+        return "Project updated successfully!"
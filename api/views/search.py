@@ -0,0 +1,31 @@
+from django.utils.decorators import method_decorator
+from django.views.generic import View
+from api.decorators.response import JsonResponseDec
+from api.controllers.response_format import error_response
+from api.controllers.autocomplete import name_index, parse_kinds, parse_limit
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@method_decorator(JsonResponseDec, name='dispatch')
+class Autocomplete(View):
+    """
+    Suggests club and project names for the text typed so far (?query=),
+    matching the start of the name or of any word in it.
+    ?limit= sets the number of suggestions, ?type=club|project restricts
+    them to one kind. Served from the in-process name index, without
+    querying the database.
+    """
+    def get(self, req):
+        query = req.GET.get("query")
+        if not query:
+            return error_response("Search query is required")
+        try:
+            limit = parse_limit(req.GET)
+            kinds = parse_kinds(req.GET)
+        except ValueError:
+            return error_response("Invalid limit or type")
+        return {
+            'data': name_index.complete(query, limit, kinds)
+        }
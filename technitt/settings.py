@@ -48,6 +48,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     # 'django.middleware.csrf.CsrfViewMiddleware',
@@ -57,6 +58,9 @@ MIDDLEWARE = [
 ]
 
 AUTH_USER_MODEL = 'api.User'
+
+# Sessions are stored with their user id, see api/sessions.py
+SESSION_ENGINE = 'api.sessions'
 ROOT_URLCONF = 'technitt.urls'
 
 TEMPLATES = [
@@ -93,6 +97,26 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# The file based default is shared by all workers on a host. Point
+# CACHE_BACKEND/CACHE_LOCATION at memcached or redis when running on
+# several hosts.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', '/var/tmp/technitt_cache'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 24 * 60 * 60)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+        },
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -138,3 +162,30 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+
+# Keyset pagination of collection endpoints
+
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 50))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 200))
+
+# Text search configuration used for the project and club search vectors
+SEARCH_CONFIG = os.environ.get('SEARCH_CONFIG', 'english')
+
+# Default minimum word similarity (0 to 1) of fuzzy search results
+SEARCH_TRIGRAM_THRESHOLD = float(os.environ.get('SEARCH_TRIGRAM_THRESHOLD', 0.5))
+
+# Backend of full text search: 'postgres' queries the search vectors,
+# 'memory' answers from an index held by each worker
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'postgres')
+
+# Number of latest projects listed under each club on the homepage
+HOMEPAGE_RECENT_PROJECTS = int(os.environ.get('HOMEPAGE_RECENT_PROJECTS', 4))
+
+# Default number of names suggested by the autocomplete endpoint
+AUTOCOMPLETE_LIMIT = int(os.environ.get('AUTOCOMPLETE_LIMIT', 10))
+
+# Streaming (?stream=true) of collection endpoints. Rows are fetched from the
+# server-side cursor API_STREAM_CHUNK_SIZE at a time and written out in
+# chunks of about API_STREAM_BUFFER_SIZE characters.
+API_STREAM_CHUNK_SIZE = int(os.environ.get('API_STREAM_CHUNK_SIZE', 2000))
+API_STREAM_BUFFER_SIZE = int(os.environ.get('API_STREAM_BUFFER_SIZE', 64 * 1024))
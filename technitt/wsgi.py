@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'technitt.settings')
 
 application = get_wsgi_application()
+
+# Apps are loaded in every worker (lazy-apps), so this builds the in-process
+# indexes and privilege registry of each worker before it serves requests
+from api.controllers import autocomplete, privileges, search_index  # pylint: disable=wrong-import-position
+
+search_index.warm_up()
+autocomplete.warm_up()
+privileges.warm_up()